@@ -0,0 +1,43 @@
+"""
+Compares single-pair queries of Graph.dijkstra and Graph.bidirectional_dijkstra.
+
+Run from the project root:
+    python -m benchmarks.bidirectional
+"""
+import random
+import time
+
+from benchmarks.dijkstra_engines import build_random_graph
+
+SIZES = [1000, 10000, 50000]
+QUERIES = 20
+
+
+def time_queries(query, pairs, graph):
+    """Returns (total seconds, total nodes expanded) for all pairs."""
+    elapsed = 0.0
+    expanded = 0
+    for a, b in pairs:
+        t0 = time.perf_counter()
+        query(a, b)
+        elapsed += time.perf_counter() - t0
+        expanded += graph.last_query_stats["expanded"]
+    return elapsed, expanded
+
+
+def main():
+    print(f"{'stars':>7} {'dijkstra (ms)':>14} {'settled':>9} "
+          f"{'bidir (ms)':>11} {'settled':>9} {'speedup':>8}")
+    for n in SIZES:
+        graph = build_random_graph(n)
+        rng = random.Random(n)
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(QUERIES)]
+
+        uni_t, uni_n = time_queries(graph.dijkstra, pairs, graph)
+        bi_t, bi_n = time_queries(graph.bidirectional_dijkstra, pairs, graph)
+        print(f"{n:>7} {uni_t / QUERIES * 1000:>14.3f} {uni_n // QUERIES:>9} "
+              f"{bi_t / QUERIES * 1000:>11.3f} {bi_n // QUERIES:>9} {uni_t / bi_t:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compares contraction-hierarchy queries with Graph.bidirectional_dijkstra on
+synthetic galaxies, and reports how many queries pay back the build.
+
+Run from the project root:
+    python -m benchmarks.contraction_hierarchy
+"""
+import math
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.galaxy_generator import write_galaxy
+from classes.contraction_hierarchy import ContractionHierarchy
+from classes.graph import Graph
+from classes.json_manager import JsonManager
+
+SIZES = [50, 250, 1000, 4000, 16000]
+QUERIES = 200
+
+
+def load_galaxy(n_stars, workdir):
+    """Generates a galaxy and loads it through JsonManager."""
+    path = os.path.join(workdir, f"galaxy_{n_stars}.json")
+    write_galaxy(path, n_stars)
+    graph = Graph()
+    JsonManager(graph, snapshots=False).load_file(path)
+    return graph
+
+
+def time_queries(query, pairs):
+    """Returns (total seconds, distances) for all pairs."""
+    distances = []
+    t0 = time.perf_counter()
+    for a, b in pairs:
+        distances.append(query(a, b))
+    return time.perf_counter() - t0, distances
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in SIZES:
+            graph = load_galaxy(n, workdir)
+            t0 = time.perf_counter()
+            hierarchy = ContractionHierarchy.build(graph)
+            build = time.perf_counter() - t0
+
+            ids = list(graph.nodes)
+            rng = random.Random(n)
+            pairs = [(rng.choice(ids), rng.choice(ids)) for _ in range(QUERIES)]
+            ch_t, ch_d = time_queries(lambda a, b: hierarchy.query(a, b)[0], pairs)
+            bi_t, bi_d = time_queries(
+                lambda a, b: graph.bidirectional_dijkstra(a, b)[0].get(b, math.inf), pairs)
+            mismatches = sum(1 for x, y in zip(ch_d, bi_d) if not math.isclose(x, y))
+            rows.append((n, build, len(hierarchy.up_targets), ch_t, bi_t, mismatches))
+
+    print(f"{'stars':>7} {'build (s)':>10} {'up edges':>9} {'ch (ms)':>9} "
+          f"{'bidir (ms)':>11} {'speedup':>8} {'break-even':>11} {'wrong':>6}")
+    crossover = None
+    for n, build, up_edges, ch_t, bi_t, mismatches in rows:
+        saved = (bi_t - ch_t) / QUERIES
+        break_even = f"{math.ceil(build / saved)}" if saved > 0 else "never"
+        if crossover is None and ch_t < bi_t:
+            crossover = n
+        print(f"{n:>7} {build:>10.2f} {up_edges:>9} {ch_t / QUERIES * 1000:>9.3f} "
+              f"{bi_t / QUERIES * 1000:>11.3f} {bi_t / ch_t:>7.1f}x {break_even:>11} {mismatches:>6}")
+
+    if crossover is None:
+        print("Contraction-hierarchy queries never overtook bidirectional Dijkstra in this range.")
+    else:
+        print(f"Contraction-hierarchy queries are faster from {crossover} stars on; "
+              f"break-even is the number of queries that pays back the build.")
+
+
+if __name__ == "__main__":
+    main()
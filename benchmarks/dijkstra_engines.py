@@ -0,0 +1,66 @@
+"""
+Compares the heap and linear Dijkstra engines of Graph on random galaxies.
+
+Run from the project root:
+    python -m benchmarks.dijkstra_engines
+"""
+import random
+import time
+
+from classes.graph import Graph
+from classes.star import Star
+
+SIZES = [3, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+DEGREE = 4
+REPEATS = 3
+
+
+def build_random_graph(n_stars, degree=DEGREE, seed=0):
+    """Builds a connected random galaxy with about n_stars * degree / 2 edges."""
+    rng = random.Random(seed)
+    graph = Graph()
+    for i in range(n_stars):
+        graph.add_node(Star(i, f"S{i}", rng.uniform(0, 200), rng.uniform(0, 200)))
+
+    # A random spanning chain keeps the galaxy connected
+    order = list(range(n_stars))
+    rng.shuffle(order)
+    for a, b in zip(order, order[1:]):
+        graph.add_edge(a, b, rng.randint(1, 100))
+
+    for _ in range(max(0, n_stars * degree // 2 - (n_stars - 1))):
+        a, b = rng.randrange(n_stars), rng.randrange(n_stars)
+        if a != b:
+            graph.add_edge(a, b, rng.randint(1, 100))
+    return graph
+
+
+def time_engine(graph, engine, repeats=REPEATS):
+    """Returns the best wall-clock time of a full single-source query."""
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        graph.dijkstra(0, engine=engine)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    print(f"{'stars':>7} {'heap (ms)':>11} {'linear (ms)':>12} {'speedup':>8}")
+    crossover = None
+    for n in SIZES:
+        graph = build_random_graph(n)
+        heap = time_engine(graph, "heap")
+        linear = time_engine(graph, "linear")
+        if crossover is None and heap < linear:
+            crossover = n
+        print(f"{n:>7} {heap * 1000:>11.3f} {linear * 1000:>12.3f} {linear / heap:>7.1f}x")
+
+    if crossover is None:
+        print("Heap engine never overtook the linear one in this range.")
+    else:
+        print(f"Heap engine is faster from {crossover} stars on.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Cross-checks DonkeyBatch against the scalar Donkey and compares their speed.
+
+N donkeys with random starting parameters go through the same random sequence
+of travel / eat / research / recharge steps, once as Donkey objects and once as
+a DonkeyBatch; every field must match exactly after every step.
+
+Run from the project root:
+    python -m benchmarks.donkey_batch
+"""
+import contextlib
+import os
+import random
+import time
+
+import numpy as np
+
+from classes.donkey import Donkey
+from classes.donkey_batch import DonkeyBatch
+from classes.star import Star
+
+SIZES = [100, 1000, 10000]
+STEPS = 60
+
+
+def random_donkeys(n, rng):
+    healths = Donkey.HEALTH_LEVELS[:-1]
+    return [Donkey(health=rng.choice(healths), energy=rng.uniform(0, 100),
+                   grass_kg=rng.choice([0, rng.uniform(0, 5)]), life_left=rng.uniform(1, 120))
+            for _ in range(n)]
+
+
+def random_steps(count, rng):
+    steps = []
+    for _ in range(count):
+        kind = rng.choice(["move", "research", "eat", "recharge", "star"])
+        star = Star(0, "S", 0, 0, is_hypergiant=rng.random() < 0.3,
+                    life_delta=rng.randint(-4, 6), investigation_time=rng.uniform(0, 4),
+                    energy_cost=rng.uniform(0, 25))
+        steps.append((kind, rng.uniform(0, 20), rng.uniform(0, 2), star))
+    return steps
+
+
+def run_scalar(donkeys, steps):
+    for kind, distance, kg, star in steps:
+        for d in donkeys:
+            if kind == "move":
+                d.move_to(star, distance)
+            elif kind == "research":
+                d.research_at_star(star)
+            elif kind == "eat":
+                d.eat_grass(kg)
+            elif kind == "recharge":
+                d.recharge_on_hypergiant()
+            elif d.is_alive():
+                # Simulator.handle_star_interaction
+                if d.energy < 50 and d.grass_kg > 0:
+                    d.eat_grass(1)
+                d.research_at_star(star)
+                if star.is_hypergiant:
+                    d.recharge_on_hypergiant()
+
+
+def run_batch(batch, steps):
+    for kind, distance, kg, star in steps:
+        if kind == "move":
+            batch.move_to(distance)
+        elif kind == "research":
+            batch.research_at_star(star.energy_cost, star.investigation_time, star.life_delta)
+        elif kind == "eat":
+            batch.eat_grass(kg)
+        elif kind == "recharge":
+            batch.recharge_on_hypergiant()
+        else:
+            batch.handle_star(star)
+
+
+def same_state(donkeys, batch):
+    return (
+        [d.health for d in donkeys] == batch.health_names()
+        and np.array_equal([d.energy for d in donkeys], batch.energy)
+        and np.array_equal([d.grass_kg for d in donkeys], batch.grass_kg)
+        and np.array_equal([d.life_left for d in donkeys], batch.life_left)
+        and np.array_equal([d.alive for d in donkeys], batch.alive)
+        and np.array_equal([d.is_alive() for d in donkeys], batch.is_alive())
+    )
+
+
+def cross_check(n, steps=STEPS, seed=0):
+    """Runs both implementations step by step; raises AssertionError on any difference."""
+    rng = random.Random(seed)
+    donkeys = random_donkeys(n, rng)
+    batch = DonkeyBatch.from_donkeys(donkeys)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i, step in enumerate(random_steps(steps, rng)):
+            run_scalar(donkeys, [step])
+            run_batch(batch, [step])
+            assert same_state(donkeys, batch), f"DonkeyBatch diverged at step {i}: {step[0]}"
+
+
+def main():
+    for seed in range(20):
+        cross_check(200, seed=seed)
+    print("Cross-check passed: DonkeyBatch matches Donkey on 20 random runs.")
+
+    print(f"{'donkeys':>8} {'scalar (ms)':>12} {'batch (ms)':>11} {'speedup':>8}")
+    for n in SIZES:
+        rng = random.Random(n)
+        donkeys = random_donkeys(n, rng)
+        batch = DonkeyBatch.from_donkeys(donkeys)
+        steps = random_steps(STEPS, rng)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            t0 = time.perf_counter()
+            run_scalar(donkeys, steps)
+            scalar = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        run_batch(batch, steps)
+        vector = time.perf_counter() - t0
+        print(f"{n:>8} {scalar * 1000:>12.1f} {vector * 1000:>11.1f} {scalar / vector:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
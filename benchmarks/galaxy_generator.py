@@ -0,0 +1,167 @@
+"""
+Deterministic synthetic galaxy generator.
+
+Emits constellation JSON in the same schema as json/Constellations.json
+("constellations" -> "starts" with "id", "label", "linkedTo", "coordenates", ...)
+so the files load through JsonManager like the real data.
+
+Stars sit on a jittered grid; a snake-shaped spanning path keeps the galaxy
+connected and extra links go to random nearby grid cells, so distances behave
+like a real map. Constellations are bands of consecutive stars; a fraction of
+the stars is also listed in the next constellation (overlap).
+
+Run from the project root:
+    python -m benchmarks.galaxy_generator 10000 galaxy_10k.json --degree 4
+"""
+import argparse
+import json
+import math
+
+import numpy as np
+
+GREEK = ["Alpha", "Beta", "Gamma", "Delta", "Epsilon", "Zeta", "Eta", "Theta"]
+SPACING = 10          # Distance between grid neighbours
+LINK_RADIUS = 2       # Extra links go up to this many grid cells away
+
+
+def _galaxy_arrays(n_stars, degree, hypergiant_ratio, overlap, stars_per_constellation, seed):
+    """All star attributes and the CSR adjacency as NumPy arrays."""
+    rng = np.random.default_rng(seed)
+    side = max(1, math.ceil(math.sqrt(n_stars)))
+    idx = np.arange(n_stars)
+    gx, gy = idx % side, idx // side
+    x = np.round(gx * SPACING + rng.uniform(0, SPACING * 0.6, n_stars), 1)
+    y = np.round(gy * SPACING + rng.uniform(0, SPACING * 0.6, n_stars), 1)
+
+    # Snake path along the rows keeps everything connected
+    src = [idx[1:]]
+    dst = [np.where(gx[1:] > 0, idx[1:] - 1, idx[1:] - side)]
+
+    # Extra random links to nearby cells
+    extra = max(0, int(n_stars * (degree - 2) / 2))
+    if extra and n_stars > 1:
+        a = rng.integers(0, n_stars, extra)
+        dx = rng.integers(-LINK_RADIUS, LINK_RADIUS + 1, extra)
+        dy = rng.integers(-LINK_RADIUS, LINK_RADIUS + 1, extra)
+        bx, by = gx[a] + dx, gy[a] + dy
+        b = by * side + bx
+        ok = (bx >= 0) & (bx < side) & (by >= 0) & (b < n_stars) & (b != a)
+        src.append(a[ok])
+        dst.append(b[ok])
+
+    src = np.concatenate(src)
+    dst = np.concatenate(dst)
+    lo, hi = np.minimum(src, dst), np.maximum(src, dst)
+    pairs = np.unique(lo.astype(np.int64) * n_stars + hi)
+    lo, hi = pairs // n_stars, pairs % n_stars
+    dist = np.maximum(1, np.rint(np.hypot(x[lo] - x[hi], y[lo] - y[hi])
+                                 * rng.uniform(1.0, 1.3, len(lo)))).astype(np.int64)
+
+    # Both directions, grouped by origin (CSR)
+    origin = np.concatenate((lo, hi))
+    target = np.concatenate((hi, lo))
+    weight = np.concatenate((dist, dist))
+    order = np.argsort(origin, kind="stable")
+    target, weight = target[order], weight[order]
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(origin, minlength=n_stars))))
+
+    stars = {
+        "x": x.tolist(),
+        "y": y.tolist(),
+        "hypergiant": (rng.random(n_stars) < hypergiant_ratio).tolist(),
+        "timeToEat": rng.integers(1, 6, n_stars).tolist(),
+        "amountOfEnergy": rng.integers(1, 11, n_stars).tolist(),
+        "radius": np.round(rng.uniform(0.1, 1.0, n_stars), 2).tolist(),
+    }
+
+    n_const = max(1, math.ceil(n_stars / stars_per_constellation))
+    home = idx // stars_per_constellation
+    shared = np.flatnonzero(rng.random(n_stars) < overlap) if n_const > 1 else np.array([], int)
+    return stars, indptr.tolist(), target.tolist(), weight.tolist(), home, shared, n_const
+
+
+def iter_constellations(n_stars, degree=4, hypergiant_ratio=0.05, overlap=0.02,
+                        stars_per_constellation=500, seed=0):
+    """Yields the constellation dicts of a galaxy one at a time."""
+    stars, indptr, target, weight, home, shared, n_const = _galaxy_arrays(
+        n_stars, degree, hypergiant_ratio, overlap, stars_per_constellation, seed)
+
+    # Shared stars are also listed in the next constellation
+    guests = {}
+    for i in shared.tolist():
+        guests.setdefault((int(home[i]) + 1) % n_const, []).append(i)
+
+    def star_dict(i):
+        return {
+            "id": i + 1,
+            "label": f"{GREEK[i % len(GREEK)]}{i + 1}",
+            "linkedTo": [{"starId": target[k] + 1, "distance": weight[k]}
+                         for k in range(indptr[i], indptr[i + 1])],
+            "radius": stars["radius"][i],
+            "timeToEat": stars["timeToEat"][i],
+            "amountOfEnergy": stars["amountOfEnergy"][i],
+            "coordenates": {"x": stars["x"][i], "y": stars["y"][i]},
+            "hypergiant": stars["hypergiant"][i],
+        }
+
+    for c in range(n_const):
+        first = c * stars_per_constellation
+        members = list(range(first, min(first + stars_per_constellation, n_stars)))
+        members += guests.get(c, [])
+        yield {"name": f"Constellation {c + 1}", "starts": [star_dict(i) for i in members]}
+
+
+def _header(n_stars):
+    return {
+        "burroenergiaInicial": 100,
+        "estadoSalud": "Excelente",
+        "pasto": 300,
+        "number": n_stars,
+        "startAge": 12,
+        "deathAge": 3567,
+    }
+
+
+def generate_galaxy(n_stars, **options):
+    """Returns the whole galaxy as a dict (fine up to ~100k stars)."""
+    data = {"constellations": list(iter_constellations(n_stars, **options))}
+    data.update(_header(n_stars))
+    return data
+
+
+def write_galaxy(path, n_stars, **options):
+    """
+    Writes the galaxy to path one constellation at a time, so even 1M stars
+    never need the whole document in memory. Returns the number of bytes written.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"constellations": [')
+        for i, constellation in enumerate(iter_constellations(n_stars, **options)):
+            if i:
+                f.write(", ")
+            f.write(json.dumps(constellation))
+        f.write("], ")
+        f.write(json.dumps(_header(n_stars))[1:])
+        return f.tell()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic constellation JSON.")
+    parser.add_argument("stars", type=int, help="number of stars")
+    parser.add_argument("output", help="JSON file to write")
+    parser.add_argument("--degree", type=float, default=4, help="average connections per star")
+    parser.add_argument("--hypergiants", type=float, default=0.05, help="ratio of hypergiant stars")
+    parser.add_argument("--overlap", type=float, default=0.02,
+                        help="ratio of stars also listed in a second constellation")
+    parser.add_argument("--per-constellation", type=int, default=500, help="stars per constellation")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    size = write_galaxy(args.output, args.stars, degree=args.degree,
+                        hypergiant_ratio=args.hypergiants, overlap=args.overlap,
+                        stars_per_constellation=args.per_constellation, seed=args.seed)
+    print(f"Wrote {args.stars} stars to {args.output} ({size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Shortest-path / simulation benchmark suite on synthetic galaxies.
+
+For every size a galaxy is generated with benchmarks.galaxy_generator, loaded
+through JsonManager and then each operation is timed. Operations that would
+take too long at a size (e.g. the O(V·E) classic Bellman-Ford at 100k stars)
+are recorded as skipped. Results go to a JSON file so runs can be compared.
+
+Run from the project root:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --sizes 1000 10000 100000 1000000 --out results.json
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.galaxy_generator import write_galaxy
+from classes.donkey import Donkey
+from classes.graph import Graph
+from classes.json_manager import JsonManager
+from classes.simulator import Simulator
+
+SIZES = [1000, 10000, 100000]
+REPEATS = 3
+
+
+def _start(graph):
+    return next(iter(graph.nodes))
+
+
+def _simulate(graph, manager):
+    donkey = Donkey(health="excellent", age=5, energy=100, grass_kg=10, life_left=100)
+    simulator = Simulator(graph, donkey, manager)
+    simulator.event_log.echo = False     # Events are still recorded, just not printed
+    return simulator.start_simulation(_start(graph), mode="max_stars")
+
+
+# (name, function(graph, manager), largest size it is run on)
+OPERATIONS = [
+    ("dijkstra heap", lambda g, m: g.dijkstra(_start(g), engine="heap"), None),
+    ("dijkstra linear", lambda g, m: g.dijkstra(_start(g), engine="linear"), 10000),
+    ("bellman_ford classic", lambda g, m: g.bellman_ford(_start(g), engine="classic"), 10000),
+    ("bellman_ford queue", lambda g, m: g.bellman_ford(_start(g), engine="queue"), None),
+    ("bellman_ford vectorized", lambda g, m: g.bellman_ford(_start(g), engine="vectorized"), 100000),
+    ("start_simulation", _simulate, 100000),
+]
+
+
+def time_call(function, repeats):
+    """Best wall-clock time of repeats calls."""
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_size(n_stars, workdir, repeats=REPEATS, degree=4, seed=0):
+    """Generates, loads and benchmarks one galaxy size; returns result rows."""
+    path = os.path.join(workdir, f"galaxy_{n_stars}.json")
+    t0 = time.perf_counter()
+    size = write_galaxy(path, n_stars, degree=degree, seed=seed)
+    rows = [{"operation": "generate", "seconds": time.perf_counter() - t0}]
+
+    graph = Graph()
+    manager = JsonManager(graph)
+    t0 = time.perf_counter()
+    manager.load_file(path)
+    rows.append({"operation": "JsonManager load", "seconds": time.perf_counter() - t0})
+
+    # Second start: the snapshot written by the first load is mapped instead of parsed
+    t0 = time.perf_counter()
+    JsonManager(Graph()).load_file(path)
+    rows.append({"operation": "JsonManager load (snapshot)", "seconds": time.perf_counter() - t0})
+
+    for name, function, limit in OPERATIONS:
+        if limit is not None and n_stars > limit:
+            rows.append({"operation": name, "seconds": None, "skipped": f"more than {limit} stars"})
+            continue
+        # The simulation mutates the donkey and writes the JSON: time it once
+        count = 1 if name == "start_simulation" else repeats
+        rows.append({"operation": name,
+                     "seconds": time_call(lambda: function(graph, manager), count)})
+
+    edges = sum(len(neighbors) for neighbors in graph.adjacency.values()) // 2
+    for row in rows:
+        row.update({"stars": n_stars, "edges": edges, "file_mb": round(size / 1e6, 2)})
+    # Finish the simulation's deferred save before its file goes away
+    if manager.persister is not None:
+        manager.persister.close()
+    os.remove(path)
+    os.remove(f"{path}.snap")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading, shortest paths and simulation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--degree", type=float, default=4)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'stars':>8} {'operation':<24} {'seconds':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            for row in run_size(n, workdir, args.repeats, args.degree, args.seed):
+                results.append(row)
+                seconds = "skipped" if row["seconds"] is None else f"{row['seconds']:.4f}"
+                print(f"{n:>8} {row['operation']:<24} {seconds:>10}")
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "degree": args.degree,
+        "repeats": args.repeats,
+        "seed": args.seed,
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
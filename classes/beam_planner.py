@@ -0,0 +1,111 @@
+import time
+from collections import namedtuple
+from .route_planner import RoutePlanner, advance, state_from_donkey
+
+# One partial route: last star index, visited bitmask, MissionState, stars visited,
+# distance travelled and the parent node (to rebuild the route)
+BeamNode = namedtuple("BeamNode", ["last", "mask", "state", "visits", "travelled", "parent"])
+
+
+def default_score(node):
+    """More stars first; among equals, prefer the donkey with more life and energy left."""
+    state = node.state
+    return node.visits + 0.001 * (state.life + state.energy + state.grass) - 0.1 * state.health
+
+
+def distance_score(node):
+    """More stars first; among equals, prefer the shortest distance travelled."""
+    return node.visits - 1e-6 * node.travelled
+
+
+class BeamSearchPlanner(RoutePlanner):
+    """
+    Beam search over (current star, visited set, donkey energy/grass/life) states.
+    Each round expands every kept state by one star and keeps only the `width`
+    best children according to `score(node)`. Equivalent states (same star, same
+    visited set and same rounded resources) are hashed and expanded only once.
+
+    A wider beam gives better routes at the cost of planning time; width=1 is the
+    greedy walk.
+    """
+
+    def __init__(self, graph, width=32, score=default_score, time_limit=2.0, precision=1):
+        super().__init__(graph, time_limit=time_limit)
+        self.width = width
+        self.score = score
+        self.precision = precision     # Decimals kept when hashing resources
+
+    def plan(self, start_id, donkey):
+        """Returns the list of star IDs to visit, starting at start_id."""
+        started = time.perf_counter()
+        self._deadline = started + self.time_limit
+        ids, dist = self._candidates(start_id)
+        stars = [self.graph.get_star(sid) for sid in ids]
+        n = len(ids)
+
+        beam = [BeamNode(0, 1, state_from_donkey(donkey), 1, 0.0, None)]
+        best = beam[0]
+        rounds = expanded = duplicates = 0
+        complete = True
+
+        while beam:
+            if self._timed_out():
+                complete = False
+                break
+            rounds += 1
+            children = {}
+            for node in beam:
+                row = dist[node.last]
+                for j in range(1, n):
+                    if node.mask >> j & 1 or row[j] == float("inf"):
+                        continue
+                    state = advance(node.state, row[j], stars[j])
+                    if state is None:
+                        continue
+                    expanded += 1
+                    child = BeamNode(j, node.mask | 1 << j, state, node.visits + 1,
+                                     node.travelled + row[j], node)
+                    key = self._state_key(child)
+                    kept = children.get(key)
+                    if kept is None:
+                        children[key] = child
+                    else:
+                        duplicates += 1
+                        if child.travelled < kept.travelled:
+                            children[key] = child
+
+            beam = sorted(children.values(), key=self.score, reverse=True)[:self.width]
+            if beam and self.score(beam[0]) > self.score(best):
+                best = beam[0]
+
+        route = []
+        node = best
+        while node is not None:
+            route.append(ids[node.last])
+            node = node.parent
+        route.reverse()
+        if not complete:
+            greedy, _ = self._greedy(dist, stars, state_from_donkey(donkey))
+            if len(greedy) > len(route):
+                route = [ids[i] for i in greedy]
+
+        self.last_stats = {
+            "method": "beam_search",
+            "width": self.width,
+            "candidates": n - 1,
+            "stars": len(route),
+            "rounds": rounds,
+            "expanded": expanded,
+            "duplicates": duplicates,
+            "complete": complete,
+            "optimal": False,
+            "elapsed": time.perf_counter() - started,
+        }
+        return route
+
+    def _state_key(self, node):
+        """Hashable key shared by equivalent states."""
+        state = node.state
+        p = self.precision
+        return (node.last, node.mask, round(state.energy, p), round(state.grass, p),
+                round(state.life, p), state.health)
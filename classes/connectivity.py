@@ -0,0 +1,159 @@
+from collections import deque
+
+
+class ConnectivityIndex:
+    """
+    Connected components of the galaxy, kept in a union-find structure.
+    Adding stars or connections only merges components, which union-find handles
+    in near-constant time. Removing or blocking a connection may split a
+    component, so that component is only marked dirty and recomputed with a BFS
+    over its own stars the next time a query needs it.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.parent = {}       # {star_id: parent star_id}
+        self.members = {}      # {root star_id: set of star_ids}
+        self.dirty = set()     # Roots of components that may have split
+
+        self.builds = 0
+        self.recomputed = 0    # Components recomputed after removals
+        self.rebuild()
+
+    # -----------------------------
+    #  Construction / updates
+    # -----------------------------
+    def rebuild(self):
+        """Builds the components of the whole graph with union-find."""
+        self.parent = {}
+        self.members = {}
+        self.dirty = set()
+        for star_id in self._all_ids():
+            self._make_set(star_id)
+        for star_id in list(self.parent):
+            for neighbor_id, _ in self.graph.get_neighbors(star_id):
+                self._union(star_id, neighbor_id)
+        self.builds += 1
+
+    def node_added(self, star_id):
+        if star_id not in self.parent:
+            self._make_set(star_id)
+
+    def edge_inserted(self, origin_id, dest_id):
+        self._union(origin_id, dest_id)
+
+    def edge_removed(self, origin_id, dest_id):
+        if origin_id in self.parent:
+            self.dirty.add(self._find(origin_id))
+
+    # -----------------------------
+    #  Queries
+    # -----------------------------
+    def component_id(self, star_id):
+        """Representative star of the component containing star_id (None if unknown)."""
+        if star_id not in self.parent:
+            return None
+        root = self._find(star_id)
+        if root in self.dirty:
+            self._recompute(root)
+            root = self._find(star_id)
+        return root
+
+    def component(self, star_id):
+        """Set of star IDs connected to star_id (shared, do not modify)."""
+        root = self.component_id(star_id)
+        return self.members[root] if root is not None else set()
+
+    def is_reachable(self, origin_id, dest_id):
+        """True if a path exists between the two stars."""
+        root = self.component_id(origin_id)
+        return root is not None and root == self.component_id(dest_id)
+
+    def components(self):
+        """List of all components (sets of star IDs), largest first."""
+        self._recompute_dirty()
+        return sorted(self.members.values(), key=len, reverse=True)
+
+    def count(self):
+        """Number of connected components."""
+        self._recompute_dirty()
+        return len(self.members)
+
+    def is_split(self):
+        """True if the galaxy is not a single connected component."""
+        return self.count() > 1
+
+    def stats(self):
+        return {
+            "components": len(self.members),
+            "dirty": len(self.dirty),
+            "builds": self.builds,
+            "recomputed": self.recomputed,
+        }
+
+    # -----------------------------
+    #  Union-find internals
+    # -----------------------------
+    def _all_ids(self):
+        ids = list(self.graph.nodes)
+        ids.extend(sid for sid in self.graph.adjacency if sid not in self.graph.nodes)
+        return ids
+
+    def _make_set(self, star_id):
+        self.parent[star_id] = star_id
+        self.members[star_id] = {star_id}
+
+    def _find(self, star_id):
+        root = star_id
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[star_id] != root:          # Path compression
+            self.parent[star_id], star_id = root, self.parent[star_id]
+        return root
+
+    def _union(self, a, b):
+        self.node_added(a)
+        self.node_added(b)
+        ra, rb = self._find(a), self._find(b)
+        if ra == rb:
+            return ra
+        if len(self.members[ra]) < len(self.members[rb]):   # Union by size
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.members[ra] |= self.members.pop(rb)
+        if rb in self.dirty:
+            self.dirty.discard(rb)
+            self.dirty.add(ra)
+        return ra
+
+    def _recompute_dirty(self):
+        while self.dirty:
+            self._recompute(next(iter(self.dirty)))
+
+    def _recompute(self, root):
+        """Splits a dirty component into its current connected pieces."""
+        self.dirty.discard(root)
+        stars = self.members.pop(root)
+        for star_id in stars:
+            self._make_set(star_id)
+
+        seen = set()
+        for star_id in stars:
+            if star_id in seen:
+                continue
+            seen.add(star_id)
+            piece = {star_id}
+            queue = deque([star_id])
+            while queue:
+                u = queue.popleft()
+                for v, _ in self.graph.get_neighbors(u):
+                    if v not in seen:
+                        seen.add(v)
+                        piece.add(v)
+                        queue.append(v)
+            for v in piece:
+                self.parent[v] = star_id
+                if v != star_id:
+                    del self.members[v]
+            self.members[star_id] = piece
+        self.recomputed += 1
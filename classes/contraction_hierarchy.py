@@ -0,0 +1,301 @@
+import heapq
+import json
+import math
+import os
+import numpy as np
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over a Graph for fast repeated point-to-point queries.
+    Stars are contracted one by one (fewest estimated shortcuts first); every contracted
+    star keeps its "upward" edges to the stars contracted after it, so a query is a
+    small bidirectional search that only climbs the hierarchy.
+    The hierarchy can be saved to / loaded from a .npz file tagged with the graph's
+    content hash.
+    """
+
+    WITNESS_SETTLE_LIMIT = 60     # Stars a witness search may settle before giving up
+    WITNESS_HOP_LIMIT = 4         # Edges a witness path may use
+
+    def __init__(self, ids, rank, up_indptr, up_targets, up_weights, up_mids, content_hash):
+        self.ids = list(ids)
+        self.index = {sid: i for i, sid in enumerate(self.ids)}
+        self.rank = np.asarray(rank, dtype=np.int32)
+        self.up_indptr = np.asarray(up_indptr, dtype=np.int64)
+        self.up_targets = np.asarray(up_targets, dtype=np.int32)
+        self.up_weights = np.asarray(up_weights, dtype=np.float64)
+        self.up_mids = np.asarray(up_mids, dtype=np.int32)
+        self.content_hash = content_hash
+        self._load_python_lists()
+
+    def _load_python_lists(self):
+        """Query-time copies as Python lists, which are much faster to index."""
+        indptr = self.up_indptr.tolist()
+        targets = self.up_targets.tolist()
+        weights = self.up_weights.tolist()
+        mids = self.up_mids.tolist()
+        self._up = [
+            list(zip(targets[indptr[v]:indptr[v + 1]], weights[indptr[v]:indptr[v + 1]]))
+            for v in range(len(self.ids))
+        ]
+        self._mid = [
+            dict(zip(targets[indptr[v]:indptr[v + 1]], mids[indptr[v]:indptr[v + 1]]))
+            for v in range(len(self.ids))
+        ]
+        self._rank = self.rank.tolist()
+
+    # ============================================================
+    #  Preprocessing
+    # ============================================================
+    @classmethod
+    def build(cls, graph):
+        """Contracts every star of the graph and returns the hierarchy."""
+        ids = list(graph.nodes)
+        for sid in list(graph.adjacency):
+            if sid not in graph.nodes:
+                ids.append(sid)
+        index = {sid: i for i, sid in enumerate(ids)}
+        n = len(ids)
+
+        # Remaining (not yet contracted) graph: {neighbor: (distance, mid)}
+        remaining = [dict() for _ in range(n)]
+        for sid in ids:
+            u = index[sid]
+            for nid, d in graph.get_neighbors(sid):
+                v = index[nid]
+                if u != v and (v not in remaining[u] or d < remaining[u][v][0]):
+                    remaining[u][v] = (d, -1)
+
+        contracted_neighbors = [0] * n
+        level = [0] * n
+        rank = [-1] * n
+        up = [None] * n
+
+        def priority(v):
+            return (2 * (cls._estimate_shortcuts(remaining, v) - len(remaining[v]))
+                    + contracted_neighbors[v] + level[v])
+
+        priorities = [priority(v) for v in range(n)]
+        heap = [(p, v) for v, p in enumerate(priorities)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            p, v = heapq.heappop(heap)
+            if rank[v] >= 0 or p != priorities[v]:
+                continue
+            # Lazy update: re-check the estimate before contracting
+            current = priority(v)
+            if heap and current > heap[0][0]:
+                priorities[v] = current
+                heapq.heappush(heap, (current, v))
+                continue
+
+            for u, x, weight in cls._shortcuts(remaining, v):
+                if x not in remaining[u] or weight < remaining[u][x][0]:
+                    remaining[u][x] = (weight, v)
+                    remaining[x][u] = (weight, v)
+
+            up[v] = [(x, d, mid) for x, (d, mid) in remaining[v].items()]
+            for x in remaining[v]:
+                del remaining[x][v]
+                contracted_neighbors[x] += 1
+                level[x] = max(level[x], level[v] + 1)
+            neighbors = list(remaining[v])
+            remaining[v] = {}
+            rank[v] = order
+            order += 1
+
+            # Only the neighbors' degrees changed; queue their new estimates
+            for x in neighbors:
+                priorities[x] = priority(x)
+                heapq.heappush(heap, (priorities[x], x))
+
+        up_indptr = [0]
+        up_targets, up_weights, up_mids = [], [], []
+        for v in range(n):
+            for x, d, mid in up[v]:
+                up_targets.append(x)
+                up_weights.append(d)
+                up_mids.append(mid)
+            up_indptr.append(len(up_targets))
+
+        return cls(ids, rank, up_indptr, up_targets, up_weights, up_mids, graph.content_hash())
+
+    @staticmethod
+    def _estimate_shortcuts(remaining, v):
+        """
+        Cheap count of the shortcuts contracting v would add: a neighbor pair
+        only counts as covered when a direct edge is already short enough.
+        Used for the contraction order; _shortcuts() does the real witness searches.
+        """
+        neighbors = list(remaining[v].items())
+        count = 0
+        for i, (u, (du, _)) in enumerate(neighbors):
+            edges = remaining[u]
+            for x, (dx, _) in neighbors[i + 1:]:
+                direct = edges.get(x)
+                if direct is None or direct[0] > du + dx:
+                    count += 1
+        return count
+
+    @classmethod
+    def _shortcuts(cls, remaining, v):
+        """Shortcuts (u, x, distance) needed to contract v now."""
+        neighbors = list(remaining[v].items())
+        shortcuts = []
+        for i, (u, (du, _)) in enumerate(neighbors):
+            # One witness search from u covers all later neighbors at once
+            targets = {x: du + dx for x, (dx, _) in neighbors[i + 1:]}
+            if not targets:
+                continue
+            witness = cls._witness_search(remaining, u, v, targets, max(targets.values()))
+            for x, via_v in targets.items():
+                if witness.get(x, math.inf) > via_v:
+                    shortcuts.append((u, x, via_v))
+        return shortcuts
+
+    @classmethod
+    def _witness_search(cls, remaining, source, skip, targets, max_dist):
+        """
+        Bounded Dijkstra from source in the remaining graph, avoiding skip.
+        Stops once every target is settled, past max_dist, or after
+        WITNESS_SETTLE_LIMIT stars; paths longer than WITNESS_HOP_LIMIT edges are
+        not followed. A witness missed this way only costs an extra shortcut.
+        """
+        dist = {source: 0}
+        hops = {source: 0}
+        heap = [(0, source)]
+        settled = 0
+        left = len(targets)
+        while heap and settled < cls.WITNESS_SETTLE_LIMIT:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if d > max_dist:
+                break
+            settled += 1
+            if u in targets:
+                left -= 1
+                if not left:
+                    break
+            h = hops[u] + 1
+            if h > cls.WITNESS_HOP_LIMIT:
+                continue
+            for v, (w, _) in remaining[u].items():
+                if v != skip and d + w < dist.get(v, math.inf):
+                    dist[v] = d + w
+                    hops[v] = h
+                    heapq.heappush(heap, (d + w, v))
+        return dist
+
+    # ============================================================
+    #  Queries
+    # ============================================================
+    def query(self, start_id, target_id):
+        """
+        Returns (distance, path) between two stars; (math.inf, []) if unreachable.
+        Both searches only follow upward edges and meet at the highest star.
+        """
+        s = self.index.get(start_id)
+        t = self.index.get(target_id)
+        if s is None or t is None:
+            return math.inf, []
+        if s == t:
+            return 0, [start_id]
+
+        up = self._up
+        dists = ({s: 0}, {t: 0})
+        preds = ({s: None}, {t: None})
+        heaps = ([(0, s)], [(0, t)])
+        best, meet = math.inf, None
+
+        while heaps[0] or heaps[1]:
+            for side in (0, 1):
+                heap = heaps[side]
+                if not heap:
+                    continue
+                if heap[0][0] >= best:
+                    heap.clear()
+                    continue
+                d, u = heapq.heappop(heap)
+                dist = dists[side]
+                if d > dist[u]:
+                    continue
+                other = dists[1 - side]
+                if u in other and d + other[u] < best:
+                    best, meet = d + other[u], u
+                pred = preds[side]
+                for v, w in up[u]:
+                    if d + w < dist.get(v, math.inf):
+                        dist[v] = d + w
+                        pred[v] = u
+                        heapq.heappush(heap, (d + w, v))
+                        if v in other and d + w + other[v] < best:
+                            best, meet = d + w + other[v], v
+
+        if meet is None:
+            return math.inf, []
+
+        up_path = []
+        node = meet
+        while node is not None:
+            up_path.append(node)
+            node = preds[0][node]
+        up_path.reverse()
+        node = preds[1][meet]
+        while node is not None:
+            up_path.append(node)
+            node = preds[1][node]
+
+        path = [up_path[0]]
+        for a, b in zip(up_path, up_path[1:]):
+            path.extend(self._unpack(a, b)[1:])
+        return best, [self.ids[i] for i in path]
+
+    def _unpack(self, a, b):
+        """Expands an upward edge (possibly a shortcut) into original edges."""
+        result = [a]
+        stack = [(a, b)]
+        while stack:
+            u, v = stack.pop()
+            low, high = (u, v) if self._rank[u] < self._rank[v] else (v, u)
+            mid = self._mid[low][high]
+            if mid < 0:
+                result.append(v)
+            else:
+                stack.append((mid, v))
+                stack.append((u, mid))
+        return result
+
+    # ============================================================
+    #  Persistence
+    # ============================================================
+    def save(self, path):
+        """Writes the hierarchy to a .npz file."""
+        np.savez(
+            path,
+            ids=np.array(json.dumps(self.ids)),
+            content_hash=np.array(self.content_hash),
+            rank=self.rank,
+            up_indptr=self.up_indptr,
+            up_targets=self.up_targets,
+            up_weights=self.up_weights,
+            up_mids=self.up_mids,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Reads a hierarchy saved with save(); returns None if the file is missing."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return cls(
+                json.loads(str(data["ids"])),
+                data["rank"], data["up_indptr"], data["up_targets"],
+                data["up_weights"], data["up_mids"],
+                str(data["content_hash"]),
+            )
+
+    def __repr__(self):
+        return f"ContractionHierarchy(nodes={len(self.ids)}, up_edges={len(self.up_targets)})"
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+import math
+import numpy as np
+
+
+class DistanceCache:
+    """
+    Lazily built all-pairs shortest-distance cache for a Graph.
+    Small galaxies get a full matrix from a vectorized Floyd-Warshall; larger ones
+    keep an LRU of single-source rows computed with heap Dijkstra, bounded so the
+    cached rows never exceed max_bytes. The graph calls invalidate() when
+    connections change; stars added since the snapshot have no connections
+    yet, so they are treated as isolated (distance 0 to themselves only).
+    """
+
+    def __init__(self, graph, max_bytes=64 * 1024 * 1024, floyd_max_nodes=800):
+        self.graph = graph
+        self.max_bytes = max_bytes
+        self.floyd_max_nodes = floyd_max_nodes
+
+        self.frozen = None           # CSR snapshot the rows are indexed by
+        self.matrix = None           # Full matrix (Floyd-Warshall mode)
+        self.rows = OrderedDict()    # {source_index: row} (Dijkstra mode)
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    # -----------------------------
+    #  Public API
+    # -----------------------------
+    def distance(self, origin_id, dest_id):
+        """Shortest distance between two stars (math.inf if unreachable)."""
+        self._ensure_snapshot()
+        u = self.frozen.index.get(origin_id)
+        v = self.frozen.index.get(dest_id)
+        if u is None or v is None:
+            return 0.0 if origin_id == dest_id and origin_id in self.graph.nodes else math.inf
+        return float(self.row(u)[v])
+
+    def matrix_for(self, star_ids):
+        """Square NumPy matrix of shortest distances between the given stars."""
+        self._ensure_snapshot()
+        index = self.frozen.index
+        columns = np.array([index.get(sid, -1) for sid in star_ids], dtype=np.int64)
+        matrix = np.full((len(star_ids), len(star_ids)), np.inf)
+        known = columns >= 0
+        for i, col in enumerate(columns):
+            if col >= 0:
+                matrix[i, known] = self.row(int(col))[columns[known]]
+            elif star_ids[i] in self.graph.nodes:
+                matrix[i, i] = 0.0
+        return matrix
+
+    def row(self, source):
+        """Distances from the dense index source to every star."""
+        self._ensure_snapshot()
+        if self.matrix is None and self._use_floyd_warshall():
+            self.misses += 1
+            self.matrix = self._floyd_warshall()
+            return self.matrix[source]
+        if self.matrix is not None:
+            self.hits += 1
+            return self.matrix[source]
+
+        row = self.rows.get(source)
+        if row is not None:
+            self.hits += 1
+            self.rows.move_to_end(source)
+            return row
+
+        self.misses += 1
+        row, _ = self.frozen.dijkstra_arrays(source)
+        self.rows[source] = row
+        while len(self.rows) > self._row_capacity():
+            self.rows.popitem(last=False)
+        return row
+
+    def invalidate(self):
+        """Drops everything; the next query rebuilds from the current graph."""
+        if self.frozen is None and self.matrix is None and not self.rows:
+            return
+        self.frozen = None
+        self.matrix = None
+        self.rows.clear()
+        self.invalidations += 1
+
+    def stats(self):
+        """Returns counters and the memory currently held by cached distances."""
+        if self.matrix is not None:
+            mode, cached = "floyd-warshall", self.matrix.nbytes
+        else:
+            mode, cached = "dijkstra-rows", sum(r.nbytes for r in self.rows.values())
+        return {
+            "mode": mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "cached_rows": len(self.rows),
+            "bytes": cached,
+        }
+
+    # -----------------------------
+    #  Internal helpers
+    # -----------------------------
+    def _ensure_snapshot(self):
+        if self.frozen is None:
+            from .frozen_graph import FrozenGraph
+            graph = self.graph
+            self.frozen = graph.frozen if graph.frozen is not None else FrozenGraph.from_graph(graph)
+
+    def _use_floyd_warshall(self):
+        n = self.frozen.n_nodes
+        return n <= self.floyd_max_nodes and n * n * 8 <= self.max_bytes
+
+    def _row_capacity(self):
+        return max(1, self.max_bytes // max(1, self.frozen.n_nodes * 8))
+
+    def _floyd_warshall(self):
+        """Vectorized Floyd-Warshall: one NumPy broadcast per intermediate star."""
+        frozen = self.frozen
+        n = frozen.n_nodes
+        src = np.repeat(np.arange(n), np.diff(frozen.indptr))
+        matrix = np.full((n, n), np.inf)
+        np.minimum.at(matrix, (src, frozen.indices), frozen.effective_weights())
+        np.fill_diagonal(matrix, 0)
+        for k in range(n):
+            np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+        return matrix
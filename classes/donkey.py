@@ -5,6 +5,13 @@ class Donkey:
     """
 
     HEALTH_LEVELS = ["excellent", "good", "regular", "bad", "dying", "dead"]
+    RECOVERY_RATES = {           # Energy recovered per kg of grass, by health
+        "excellent": 5,
+        "good": 4,
+        "regular": 3,
+        "bad": 2,
+        "dying": 1
+    }
 
     def __init__(self, health="excellent", age=5, energy=100, grass_kg=10, life_left=100):
         self.health = health              # Health condition
@@ -46,13 +53,7 @@ class Donkey:
         kg_to_eat = min(kg, self.grass_kg)
         self.grass_kg -= kg_to_eat
 
-        recovery_rate = {
-            "excellent": 5,
-            "good": 4,
-            "regular": 3,
-            "bad": 2,
-            "dying": 1
-        }.get(self.health, 0)
+        recovery_rate = self.RECOVERY_RATES.get(self.health, 0)
 
         recovered = recovery_rate * kg_to_eat
         self.energy = min(100, self.energy + recovered)
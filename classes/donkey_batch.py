@@ -0,0 +1,164 @@
+import numpy as np
+from .donkey import Donkey
+
+HEALTH_LEVELS = Donkey.HEALTH_LEVELS
+DEAD = HEALTH_LEVELS.index("dead")
+DYING = HEALTH_LEVELS.index("dying")
+# Energy per kg of grass indexed by health level (dead donkeys recover nothing)
+RECOVERY = np.array([Donkey.RECOVERY_RATES.get(h, 0) for h in HEALTH_LEVELS], dtype=np.float64)
+
+
+class DonkeyBatch:
+    """
+    N donkeys stored as NumPy arrays (structure of arrays) for parameter sweeps.
+    Every step applies to all donkeys at once with exactly the same rules as the
+    scalar Donkey methods of the same name; steps accept scalars or per-donkey
+    arrays, and an optional boolean mask restricts them to some donkeys.
+    Health is kept as an index into Donkey.HEALTH_LEVELS.
+    """
+
+    def __init__(self, n, health="excellent", age=5, energy=100, grass_kg=10, life_left=100):
+        self.n = n
+        health = np.broadcast_to(np.asarray(health), (n,))
+        self.health = np.array([HEALTH_LEVELS.index(h) for h in health], dtype=np.int8)
+        self.age = np.broadcast_to(np.asarray(age, dtype=np.float64), (n,)).copy()
+        self.energy = np.broadcast_to(np.asarray(energy, dtype=np.float64), (n,)).copy()
+        self.grass_kg = np.broadcast_to(np.asarray(grass_kg, dtype=np.float64), (n,)).copy()
+        self.life_left = np.broadcast_to(np.asarray(life_left, dtype=np.float64), (n,)).copy()
+        self.alive = np.ones(n, dtype=bool)
+        self.deaths = 0                    # Number of die() events (the scalar class prints them)
+
+    @classmethod
+    def from_donkeys(cls, donkeys):
+        """Builds a batch with the current state of Donkey objects."""
+        donkeys = list(donkeys)
+        batch = cls(
+            len(donkeys),
+            health=[d.health for d in donkeys],
+            age=[d.age for d in donkeys],
+            energy=[d.energy for d in donkeys],
+            grass_kg=[d.grass_kg for d in donkeys],
+            life_left=[d.life_left for d in donkeys],
+        )
+        batch.alive = np.array([d.alive for d in donkeys], dtype=bool)
+        return batch
+
+    def donkey(self, i):
+        """Returns donkey i as a scalar Donkey."""
+        d = Donkey(health=HEALTH_LEVELS[self.health[i]], age=float(self.age[i]),
+                   energy=float(self.energy[i]), grass_kg=float(self.grass_kg[i]),
+                   life_left=float(self.life_left[i]))
+        d.alive = bool(self.alive[i])
+        return d
+
+    # -------------------------------------------------
+    #  Core status methods
+    # -------------------------------------------------
+    def is_alive(self):
+        return self.alive & (self.health != DEAD) & (self.life_left > 0)
+
+    def lose_life(self, amount, mask=None):
+        mask = self._mask(mask)
+        self.life_left = np.where(mask, self.life_left - amount, self.life_left)
+        self.die(mask & (self.life_left <= 0))
+
+    def consume_energy(self, amount, mask=None):
+        mask = self._mask(mask)
+        self.energy = np.where(mask, self.energy - amount, self.energy)
+        empty = mask & (self.energy <= 0)
+        self.energy[empty] = 0
+        self.update_health_on_low_energy(empty)
+
+    def eat_grass(self, kg, mask=None):
+        mask = self._mask(mask) & (self.grass_kg > 0)
+        eaten = np.minimum(kg, self.grass_kg)
+        self.grass_kg = np.where(mask, self.grass_kg - eaten, self.grass_kg)
+        recovered = RECOVERY[self.health] * eaten
+        self.energy = np.where(mask, np.minimum(100, self.energy + recovered), self.energy)
+
+    def update_health_on_low_energy(self, mask=None):
+        mask = self._mask(mask) & (self.energy < 20)
+        self.die(mask & (self.health == DYING))
+        degrade = mask & (self.health < DYING)
+        self.health[degrade] += 1
+
+    def die(self, mask):
+        self.deaths += int(np.count_nonzero(mask))
+        self.health[mask] = DEAD
+        self.alive[mask] = False
+        self.energy[mask] = 0
+
+    # -------------------------------------------------
+    #  Movement and interaction
+    # -------------------------------------------------
+    def move_to(self, distance, mask=None):
+        """Travels distance (scalar or per donkey); returns the alive mask."""
+        moving = self._mask(mask) & self.is_alive()
+        self.consume_energy(np.multiply(distance, 2), moving)
+        self.lose_life(distance, moving)
+        return self.is_alive()
+
+    def research_at_star(self, energy_cost, investigation_time, life_delta, mask=None):
+        researching = self._mask(mask) & self.is_alive()
+        self.consume_energy(energy_cost, researching)
+        self.lose_life(investigation_time, researching)
+        self.life_left = np.where(researching, self.life_left + life_delta, self.life_left)
+        return self.is_alive()
+
+    def recharge_on_hypergiant(self, mask=None):
+        charging = self._mask(mask) & self.is_alive()
+        self.energy = np.where(charging, np.minimum(100, self.energy * 1.5), self.energy)
+        self.grass_kg = np.where(charging, self.grass_kg * 2, self.grass_kg)
+
+    def handle_star(self, star, mask=None):
+        """Same sequence as Simulator.handle_star_interaction: eat, research, recharge."""
+        visiting = self._mask(mask) & self.is_alive()
+        self.eat_grass(1, visiting & (self.energy < 50) & (self.grass_kg > 0))
+        self.research_at_star(star.energy_cost, star.investigation_time, star.life_delta, visiting)
+        if star.is_hypergiant:
+            self.recharge_on_hypergiant(visiting)
+
+    def follow_route(self, graph, route):
+        """
+        Moves every donkey along route (list of star IDs) like Simulator.follow_route:
+        stars unreachable from the last star reached are skipped.
+        Returns the number of stars each donkey reached after the first one.
+        """
+        reached = np.zeros(self.n, dtype=np.int64)
+        origin = route[0] if route else None
+        for dest in route[1:]:
+            distance = graph.shortest_distance(origin, dest)
+            if distance == float("inf"):
+                continue
+            moving = self.is_alive()
+            arrived = self.move_to(distance, moving)
+            reached += arrived
+            self.handle_star(graph.get_star(dest), arrived)
+            origin = dest
+        return reached
+
+    # -------------------------------------------------
+    #  Reporting
+    # -------------------------------------------------
+    def health_names(self):
+        return [HEALTH_LEVELS[h] for h in self.health]
+
+    def to_dict(self):
+        return {
+            "n": self.n,
+            "alive": int(np.count_nonzero(self.is_alive())),
+            "mean_energy": float(self.energy.mean()) if self.n else 0.0,
+            "mean_grass_kg": float(self.grass_kg.mean()) if self.n else 0.0,
+            "mean_life_left": float(self.life_left.mean()) if self.n else 0.0,
+        }
+
+    def _mask(self, mask):
+        if mask is None:
+            return np.ones(self.n, dtype=bool)
+        return np.broadcast_to(np.asarray(mask, dtype=bool), (self.n,))
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        return f"DonkeyBatch(n={self.n}, alive={int(np.count_nonzero(self.is_alive()))})"
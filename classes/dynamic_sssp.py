@@ -0,0 +1,159 @@
+import heapq
+import math
+
+
+class DynamicShortestPaths:
+    """
+    Keeps the shortest-path tree (dist, pred) of one source star up to date while
+    edges are blocked, unblocked, added or removed (Ramalingam-Reps style).
+    Only the part of the tree affected by a change is recomputed; the counters
+    record how many stars each repair touched compared to a full recomputation.
+    Repairs assume non-negative distances, which holds for any graph the initial
+    queue-based Bellman-Ford accepts (a negative undirected edge is a negative cycle).
+    """
+
+    def __init__(self, graph, source_id):
+        self.graph = graph
+        self.source = source_id
+        self.dist = None
+        self.pred = None
+        self.children = {}          # {star_id: set of star_ids whose pred is star_id}
+
+        self.full_builds = 0
+        self.repairs = 0
+        self.nodes_touched = 0      # Stars touched by all repairs
+        self.last_touched = 0       # Stars touched by the latest repair
+
+    # -----------------------------
+    #  Public API
+    # -----------------------------
+    def tree(self):
+        """Returns the current (dist, pred) dicts, building them on first use."""
+        if self.dist is None:
+            self.rebuild()
+        return self.dist, self.pred
+
+    def rebuild(self):
+        """Recomputes the whole tree from scratch."""
+        self.dist, self.pred = self.graph.bellman_ford(self.source, engine="queue")
+        self.children = {v: set() for v in self.dist}
+        for v, p in self.pred.items():
+            if p is not None and p != v:
+                self.children.setdefault(p, set()).add(v)
+        self.full_builds += 1
+
+    def node_added(self, star_id):
+        """Registers a new (still unconnected) star."""
+        if self.dist is None or star_id in self.dist:
+            return
+        self.dist[star_id] = math.inf
+        self.pred[star_id] = None
+        self.children[star_id] = set()
+
+    def edge_removed(self, origin_id, dest_id):
+        """Repairs the tree after a connection was removed, blocked or lengthened."""
+        if self.dist is None:
+            return
+        touched = 0
+        for parent, child in ((origin_id, dest_id), (dest_id, origin_id)):
+            if self.pred.get(child) == parent and child != self.source \
+                    and not self._tree_edge_holds(parent, child):
+                touched += self._repair_subtree(child)
+        self._record(touched)
+
+    def edge_inserted(self, origin_id, dest_id, distance):
+        """Repairs the tree after a connection was added, unblocked or shortened."""
+        if self.dist is None:
+            return
+        if distance < 0:
+            self.dist = self.pred = None    # Rebuild (and report the cycle) lazily
+            return
+
+        self.node_added(origin_id)
+        self.node_added(dest_id)
+        heap = []
+        for u, v in ((origin_id, dest_id), (dest_id, origin_id)):
+            new_dist = self.dist.get(u, math.inf) + distance
+            if new_dist < self.dist[v]:
+                self.dist[v] = new_dist
+                self._set_pred(v, u)
+                heapq.heappush(heap, (new_dist, v))
+        self._record(self._propagate(heap))
+
+    def stats(self):
+        """Counters that show how much work repairs saved over recomputation."""
+        return {
+            "source": self.source,
+            "full_builds": self.full_builds,
+            "repairs": self.repairs,
+            "nodes_touched": self.nodes_touched,
+            "last_touched": self.last_touched,
+            # Stars that recomputing after every repair would have touched instead
+            "recompute_touched": self.repairs * len(self.dist) if self.dist else 0,
+        }
+
+    # -----------------------------
+    #  Internal helpers
+    # -----------------------------
+    def _record(self, touched):
+        self.repairs += 1
+        self.last_touched = touched
+        self.nodes_touched += touched
+
+    def _set_pred(self, v, u):
+        old = self.pred.get(v)
+        if old is not None and old in self.children:
+            self.children[old].discard(v)
+        self.pred[v] = u
+        if u is not None:
+            self.children.setdefault(u, set()).add(v)
+
+    def _tree_edge_holds(self, parent, child):
+        """True if the parent -> child edge still exists and still yields dist[child]."""
+        weight = self.graph.edge_distance(parent, child)
+        return weight is not None and self.dist[parent] + weight == self.dist[child]
+
+    def _repair_subtree(self, root):
+        """Recomputes the distances of root and everything below it in the tree."""
+        affected = []
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            affected.append(v)
+            stack.extend(self.children.get(v, ()))
+        affected_set = set(affected)
+
+        for v in affected:
+            self._set_pred(v, None)
+            self.dist[v] = math.inf
+
+        # Best entry point into the affected region from the intact part of the tree
+        heap = []
+        for v in affected:
+            for u, w in self.graph.get_neighbors(v):
+                if u not in affected_set and self.dist.get(u, math.inf) + w < self.dist[v]:
+                    self.dist[v] = self.dist[u] + w
+                    self._set_pred(v, u)
+            if self.dist[v] < math.inf:
+                heapq.heappush(heap, (self.dist[v], v))
+
+        self._propagate(heap)
+        return len(affected)
+
+    def _propagate(self, heap):
+        """Dijkstra from the seeded stars, only following distance improvements."""
+        settled = set()
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > self.dist[u] or u in settled:
+                continue
+            settled.add(u)
+            for v, w in self.graph.get_neighbors(u):
+                if d + w < self.dist.get(v, math.inf):
+                    self.dist[v] = d + w
+                    self._set_pred(v, u)
+                    heapq.heappush(heap, (d + w, v))
+        return len(settled)
+
+    def __repr__(self):
+        return f"DynamicShortestPaths(source={self.source}, repairs={self.repairs})"
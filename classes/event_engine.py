@@ -0,0 +1,103 @@
+import heapq
+import itertools
+import time
+from collections import namedtuple
+
+# A scheduled event: virtual time, tie-break sequence, kind and payload
+Event = namedtuple("Event", ["time", "seq", "kind", "data"])
+
+
+class EventEngine:
+    """
+    Discrete-event simulation core: a priority queue of timed events and a
+    virtual clock that jumps straight to the next event. Handlers registered
+    with on(kind, handler) receive the event and may schedule more events.
+    Events at the same time run in the order they were scheduled.
+
+    Nothing here waits on the wall clock; an optional pacer (see RealTimePacer)
+    can be given to slow playback down for presentation.
+    """
+
+    def __init__(self, pacer=None):
+        self.now = 0.0
+        self.queue = []
+        self.handlers = {}
+        self.pacer = pacer
+        self.processed = 0
+        self.running = False
+        self._seq = itertools.count()
+
+    def on(self, kind, handler):
+        """Registers handler(event) for events of the given kind."""
+        self.handlers[kind] = handler
+
+    def schedule(self, delay, kind, **data):
+        """Schedules an event delay time units from now."""
+        return self.schedule_at(self.now + max(0, delay), kind, **data)
+
+    def schedule_at(self, at, kind, **data):
+        """Schedules an event at an absolute virtual time (never in the past)."""
+        event = Event(max(at, self.now), next(self._seq), kind, data)
+        heapq.heappush(self.queue, event)
+        return event
+
+    def cancel(self, kind=None):
+        """Drops pending events (all of them, or only those of one kind)."""
+        if kind is None:
+            self.queue.clear()
+        else:
+            self.queue = [e for e in self.queue if e.kind != kind]
+            heapq.heapify(self.queue)
+
+    def stop(self):
+        """Stops run() after the current event."""
+        self.running = False
+
+    def run(self, until=None, max_events=None):
+        """
+        Processes events in time order until the queue is empty, stop() is called,
+        the next event is later than until, or max_events were handled.
+        Returns the number of events processed by this call.
+        """
+        self.running = True
+        count = 0
+        while self.queue and self.running:
+            if until is not None and self.queue[0].time > until:
+                self.now = until
+                break
+            if max_events is not None and count >= max_events:
+                break
+            event = heapq.heappop(self.queue)
+            if self.pacer is not None:
+                self.pacer(self.now, event.time)
+            self.now = event.time
+            handler = self.handlers.get(event.kind)
+            if handler is not None:
+                handler(event)
+            count += 1
+        self.processed += count
+        self.running = False
+        return count
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __repr__(self):
+        return f"EventEngine(now={self.now}, pending={len(self.queue)})"
+
+
+class RealTimePacer:
+    """
+    Presentation layer for EventEngine: sleeps between events in proportion to
+    the virtual time that passes, capped at max_sleep seconds per event.
+    """
+
+    def __init__(self, seconds_per_unit=0.05, max_sleep=0.5, sleep=time.sleep):
+        self.seconds_per_unit = seconds_per_unit
+        self.max_sleep = max_sleep
+        self.sleep = sleep
+
+    def __call__(self, previous_time, event_time):
+        delay = min(self.max_sleep, (event_time - previous_time) * self.seconds_per_unit)
+        if delay > 0:
+            self.sleep(delay)
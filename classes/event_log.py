@@ -0,0 +1,98 @@
+import json
+import time
+from collections import deque, namedtuple
+
+# Numeric severity of each level; events below EventLog.level are dropped
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+# One log entry: wall-clock time, mission (virtual) time, level, event type, star and text
+LogEvent = namedtuple("LogEvent", ["time", "mission_time", "level", "kind", "star_id", "message"])
+
+
+class EventLog:
+    """
+    Bounded, structured simulation log. Keeps the last `capacity` events in a
+    ring buffer (older ones are discarded) and can also append every event to
+    a JSONL file (spill_path) to keep the full history on disk.
+    enabled=False turns record() into a no-op for batch runs. Messages can be
+    %-format strings with args, formatted only for events that are kept.
+    """
+
+    def __init__(self, capacity=1000, level="info", echo=True, spill_path=None, enabled=True):
+        self.events = deque(maxlen=capacity)
+        self.level = level
+        self.echo = echo                 # Print messages as they are recorded
+        self.spill_path = spill_path
+        self.enabled = enabled
+        self.dropped = 0                 # Events pushed out of the ring buffer
+        self._spill = None
+
+    @property
+    def level(self):
+        return self._level_name
+
+    @level.setter
+    def level(self, name):
+        self._threshold = LEVELS[name]
+        self._level_name = name
+
+    def enabled_for(self, level):
+        """True if an event of this level would be recorded."""
+        return self.enabled and LEVELS[level] >= self._threshold
+
+    def record(self, message, level="info", kind="message", star_id=None, mission_time=None,
+               echo=True, args=()):
+        """Stores one event (message % args); returns it, or None if it was filtered out."""
+        if not self.enabled_for(level):
+            return None
+        if args:
+            message = message % args
+        event = LogEvent(time.time(), mission_time, level, kind, star_id, message)
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append(event)
+        if echo and self.echo:
+            print(message)
+        if self.spill_path:
+            self._write_spill(event)
+        return event
+
+    def messages(self, level=None, kind=None):
+        """Texts of the buffered events, optionally filtered by minimum level and kind."""
+        return [e.message for e in self.filter(level, kind)]
+
+    def filter(self, level=None, kind=None):
+        threshold = LEVELS[level] if level else 0
+        return [e for e in self.events
+                if LEVELS[e.level] >= threshold and (kind is None or e.kind == kind)]
+
+    def clear(self):
+        self.events.clear()
+        self.dropped = 0
+
+    def close(self):
+        """Closes the spill file (it is reopened in append mode on the next event)."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def _write_spill(self, event):
+        if self._spill is None:
+            self._spill = open(self.spill_path, "a", encoding="utf-8")
+        self._spill.write(json.dumps(event._asdict(), ensure_ascii=False, default=str) + "\n")
+        self._spill.flush()
+
+    def __getstate__(self):
+        # Open files cannot be pickled (e.g. when sent to Monte-Carlo workers)
+        state = self.__dict__.copy()
+        state["_spill"] = None
+        return state
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __repr__(self):
+        return f"EventLog({len(self.events)}/{self.events.maxlen} events, level={self.level})"
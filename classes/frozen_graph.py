@@ -0,0 +1,269 @@
+import heapq
+import math
+import numpy as np
+
+
+class FrozenGraph:
+    """
+    Read-only compressed sparse row (CSR) snapshot of a Graph.
+    Star IDs are remapped to dense integers 0..n-1 and the edges of node i live in
+    indices[indptr[i]:indptr[i + 1]] / weights[indptr[i]:indptr[i + 1]].
+    Edges can be masked (blocked) without rebuilding the arrays.
+    """
+
+    def __init__(self, ids, indptr, indices, weights):
+        self.ids = list(ids)                       # dense index -> star_id
+        self.index = {sid: i for i, sid in enumerate(self.ids)}
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.blocked = np.zeros(len(self.indices), dtype=bool)
+        self._effective = None                     # cached weights with blocked edges = inf
+        self.last_expanded = 0                     # nodes settled by the last dijkstra query
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Builds the CSR arrays from a Graph's nodes and adjacency dicts."""
+        ids = list(graph.nodes)
+        seen = set(ids)
+        for sid in graph.adjacency:
+            if sid not in seen:
+                ids.append(sid)
+                seen.add(sid)
+        index = {sid: i for i, sid in enumerate(ids)}
+
+        indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        for i, sid in enumerate(ids):
+            indptr[i + 1] = indptr[i] + len(graph.adjacency.get(sid, {}))
+
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        weights = np.empty(indptr[-1], dtype=np.float64)
+        for i, sid in enumerate(ids):
+            edges = graph.adjacency.get(sid, {})
+            if edges:
+                start = indptr[i]
+                indices[start:start + len(edges)] = [index[v] for v in edges]
+                weights[start:start + len(edges)] = list(edges.values())
+
+        return cls(ids, indptr, indices, weights)
+
+    # -----------------------------
+    #  Size information
+    # -----------------------------
+    @property
+    def n_nodes(self):
+        return len(self.ids)
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    @property
+    def nbytes(self):
+        """Memory used by the CSR arrays (excluding the id remap)."""
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes + self.blocked.nbytes
+
+    # -----------------------------
+    #  Edge masking
+    # -----------------------------
+    def _edge_slots(self, origin_id, dest_id):
+        """Returns the CSR positions of the edges origin -> dest."""
+        u = self.index.get(origin_id)
+        v = self.index.get(dest_id)
+        if u is None or v is None:
+            return np.empty(0, dtype=np.int64)
+        start, end = self.indptr[u], self.indptr[u + 1]
+        return np.flatnonzero(self.indices[start:end] == v) + start
+
+    def has_edge(self, origin_id, dest_id):
+        """True if the CSR contains origin -> dest (blocked or not)."""
+        return len(self._edge_slots(origin_id, dest_id)) > 0
+
+    def block(self, origin_id, dest_id):
+        """Masks both directions of a connection."""
+        self.blocked[self._edge_slots(origin_id, dest_id)] = True
+        self.blocked[self._edge_slots(dest_id, origin_id)] = True
+        self._effective = None
+
+    def unblock(self, origin_id, dest_id, distance=None):
+        """
+        Unmasks both directions of a connection, optionally with a new distance.
+        Returns False if the connection is not part of the CSR (the caller must thaw).
+        """
+        forward = self._edge_slots(origin_id, dest_id)
+        backward = self._edge_slots(dest_id, origin_id)
+        if len(forward) == 0 or len(backward) == 0:
+            return False
+        for slots in (forward, backward):
+            self.blocked[slots] = False
+            if distance is not None:
+                self.weights[slots] = distance
+        self._effective = None
+        return True
+
+    def effective_weights(self):
+        """Edge weights with blocked edges set to infinity."""
+        if self._effective is None:
+            self._effective = np.where(self.blocked, np.inf, self.weights)
+        return self._effective
+
+    # -----------------------------
+    #  Conversion helpers
+    # -----------------------------
+    def neighbors(self, star_id):
+        """Returns [(neighbor_id, distance), ...] for the unblocked edges of a star."""
+        u = self.index.get(star_id)
+        if u is None:
+            return []
+        start, end = self.indptr[u], self.indptr[u + 1]
+        return [
+            (self.ids[v], w)
+            for v, w, b in zip(self.indices[start:end].tolist(),
+                               self.weights[start:end].tolist(),
+                               self.blocked[start:end].tolist())
+            if not b
+        ]
+
+    def to_adjacency(self):
+        """Rebuilds a Graph-style adjacency dict-of-dicts from the unblocked edges."""
+        return {sid: dict(self.neighbors(sid)) for sid in self.ids}
+
+    def _to_dicts(self, dist, pred):
+        """Converts index-based dist/pred arrays into dicts keyed by star ID."""
+        ids = self.ids
+        dist_map = dict(zip(ids, dist.tolist()))
+        pred_map = {sid: (ids[p] if p >= 0 else None) for sid, p in zip(ids, pred.tolist())}
+        return dist_map, pred_map
+
+    # ============================================================
+    #  Shortest paths on the CSR arrays
+    # ============================================================
+    def dijkstra_arrays(self, source, target=None):
+        """Heap Dijkstra over dense indices. Returns (dist, pred) NumPy arrays."""
+        n = self.n_nodes
+        indptr = self.indptr.tolist()
+        indices = self.indices
+        weights = self.effective_weights()
+        dist = [math.inf] * n
+        pred = [-1] * n
+        visited = [False] * n
+        dist[source] = 0
+        heap = [(0, source)]
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if visited[u] or d > dist[u]:
+                continue
+            visited[u] = True
+            if u == target:
+                break
+
+            start, end = indptr[u], indptr[u + 1]
+            for v, w in zip(indices[start:end].tolist(), weights[start:end].tolist()):
+                new_dist = d + w
+                if not visited[v] and new_dist < dist[v]:
+                    dist[v] = new_dist
+                    pred[v] = u
+                    heapq.heappush(heap, (new_dist, v))
+
+        self.last_expanded = sum(visited)
+        return np.array(dist, dtype=np.float64), np.array(pred, dtype=np.int64)
+
+    def bellman_ford_arrays(self, source):
+        """
+        Bellman-Ford over dense indices.
+        Returns (dist, pred) NumPy arrays, or (None, None) on a negative cycle.
+        """
+        n = self.n_nodes
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        weights = self.effective_weights().tolist()
+        dist = [math.inf] * n
+        pred = [-1] * n
+        dist[source] = 0
+        pred[source] = source
+
+        for _ in range(n - 1):
+            updated = False
+            for u in range(n):
+                du = dist[u]
+                if du == math.inf:
+                    continue
+                for k in range(indptr[u], indptr[u + 1]):
+                    v = indices[k]
+                    if du + weights[k] < dist[v]:
+                        dist[v] = du + weights[k]
+                        pred[v] = u
+                        updated = True
+            if not updated:
+                break
+
+        for u in range(n):
+            for k in range(indptr[u], indptr[u + 1]):
+                if dist[u] + weights[k] < dist[indices[k]]:
+                    print("Warning: Negative weight cycle detected.")
+                    return None, None
+
+        return np.array(dist, dtype=np.float64), np.array(pred, dtype=np.int64)
+
+    def bellman_ford_vectorized_arrays(self, source):
+        """
+        Bellman-Ford that relaxes every edge of a pass at once with NumPy.
+        Returns (dist, pred) arrays; raises NegativeCycleError with dense indices.
+        """
+        from .graph import NegativeCycleError, find_cycle
+
+        n = self.n_nodes
+        src = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+        dst = self.indices.astype(np.int64)
+        weights = self.effective_weights()
+        dist = np.full(n, np.inf)
+        pred = np.full(n, -1, dtype=np.int64)
+        dist[source] = 0
+        pred[source] = source
+
+        for _ in range(max(n - 1, 0)):
+            candidate = dist[src] + weights
+            new_dist = dist.copy()
+            np.minimum.at(new_dist, dst, candidate)
+            improved = new_dist < dist
+            if not improved.any():
+                break
+            # Any edge that produced a node's new minimum becomes its predecessor
+            winners = improved[dst] & (candidate == new_dist[dst])
+            pred[dst[winners]] = src[winners]
+            dist = new_dist
+
+        violating = np.flatnonzero(dist[src] + weights < dist[dst])
+        if len(violating):
+            e = violating[0]
+            pred[dst[e]] = src[e]
+            raise NegativeCycleError(find_cycle(pred.tolist(), int(dst[e]), n))
+
+        return dist, pred
+
+    def bellman_ford_vectorized(self, start_id):
+        """Vectorized Bellman-Ford keyed by star IDs, returning (dist, pred) dicts."""
+        from .graph import NegativeCycleError
+
+        try:
+            dist, pred = self.bellman_ford_vectorized_arrays(self.index[start_id])
+        except NegativeCycleError as error:
+            raise NegativeCycleError([self.ids[i] for i in error.cycle]) from None
+        return self._to_dicts(dist, pred)
+
+    def dijkstra(self, start_id, target_id=None):
+        """Dijkstra keyed by star IDs, returning (dist, pred) dicts like Graph."""
+        target = self.index.get(target_id) if target_id is not None else None
+        dist, pred = self.dijkstra_arrays(self.index[start_id], target)
+        return self._to_dicts(dist, pred)
+
+    def bellman_ford(self, start_id):
+        """Bellman-Ford keyed by star IDs, returning (dist, pred) dicts like Graph."""
+        dist, pred = self.bellman_ford_arrays(self.index[start_id])
+        if dist is None:
+            return None, None
+        return self._to_dicts(dist, pred)
+
+    def __repr__(self):
+        return f"FrozenGraph(nodes={self.n_nodes}, edges={self.n_edges}, bytes={self.nbytes})"
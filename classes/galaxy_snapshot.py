@@ -0,0 +1,221 @@
+import gc
+import hashlib
+import json
+import os
+import numpy as np
+from .constellation import Constellation
+from .frozen_graph import FrozenGraph
+from .star import Star
+
+MAGIC = b"DONKEYSNAP\x00\x01"   # File signature + format version
+ALIGN = 64                       # Every array starts at a multiple of this offset
+
+
+def file_hash(path):
+    """SHA-256 of a file's bytes (links a snapshot to the JSON it was built from)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GalaxySnapshot:
+    """
+    Binary snapshot of a loaded galaxy, stored in one file that is opened with
+    numpy.memmap instead of being parsed:
+
+      MAGIC | header length (uint64) | JSON header | arrays (64-byte aligned)
+
+    Stars are columnar arrays in the graph's dense order (x, y, hypergiant,
+    life_delta, investigation_time, energy_cost, a galaxy code into a small
+    table, and the names as one NUL-separated UTF-8 blob). Connections are the
+    CSR arrays of FrozenGraph; constellations are CSR lists of member stars and
+    of their edges. The header keeps the star ids (unless they are all ints),
+    the constellation names and colors, the other top-level JSON fields and the
+    SHA-256 of the source JSON.
+    """
+
+    def __init__(self, header, arrays):
+        self.header = header
+        self.arrays = arrays                 # {name: ndarray or np.memmap}
+
+    @property
+    def source_hash(self):
+        return self.header["source_hash"]
+
+    # -------------------------------------------------
+    #  Building and saving
+    # -------------------------------------------------
+    @classmethod
+    def from_graph(cls, graph, source_hash, fields=None, load_report=None):
+        """Captures the stars, connections and constellations of a loaded Graph."""
+        frozen = FrozenGraph.from_graph(graph)
+        ids = frozen.ids
+        index = frozen.index
+        stars = [graph.nodes.get(sid) or Star(sid, str(sid), 0, 0) for sid in ids]
+
+        names = [str(star.name) for star in stars]
+        if any("\x00" in name for name in names):
+            raise ValueError("Star names cannot contain NUL characters")
+        galaxies = sorted({json.dumps(star.galaxy) for star in stars})
+        galaxy_code = {g: i for i, g in enumerate(galaxies)}
+
+        members, member_ptr, edges, edge_weights, edge_ptr = [], [0], [], [], [0]
+        for const in graph.constellations:
+            members.extend(index[star.id] for star in const.stars)
+            member_ptr.append(len(members))
+            for origin, dest, distance in const.edges:
+                edges.append((index[origin], index[dest]))
+                edge_weights.append(distance)
+            edge_ptr.append(len(edges))
+
+        int_ids = all(type(sid) is int for sid in ids)
+        header = {
+            "source_hash": source_hash,
+            "n_stars": len(ids),
+            "ids": None if int_ids else ids,
+            "galaxies": [json.loads(g) for g in galaxies],
+            "constellations": [[c.name, c.color] for c in graph.constellations],
+            "collapsed_duplicates": graph.collapsed_duplicates,
+            "fields": fields or {},
+            "load_report": load_report,
+        }
+        arrays = {
+            "ids": np.array(ids if int_ids else [], dtype=np.int64),
+            "x": np.array([star.x for star in stars], dtype=np.float64),
+            "y": np.array([star.y for star in stars], dtype=np.float64),
+            "hypergiant": np.array([bool(star.is_hypergiant) for star in stars], dtype=bool),
+            "life_delta": np.array([star.life_delta for star in stars], dtype=np.float64),
+            "investigation_time": np.array([star.investigation_time for star in stars], dtype=np.float64),
+            "energy_cost": np.array([star.energy_cost for star in stars], dtype=np.float64),
+            "galaxy": np.array([galaxy_code[json.dumps(star.galaxy)] for star in stars], dtype=np.int32),
+            "names": np.frombuffer("\x00".join(names).encode("utf-8"), dtype=np.uint8),
+            "indptr": frozen.indptr,
+            "indices": frozen.indices,
+            "weights": frozen.weights,
+            "member_ptr": np.array(member_ptr, dtype=np.int64),
+            "members": np.array(members, dtype=np.int32),
+            "edge_ptr": np.array(edge_ptr, dtype=np.int64),
+            "edges": np.array(edges, dtype=np.int32).reshape(-1, 2),
+            "edge_weights": np.array(edge_weights, dtype=np.float64),
+        }
+        return cls(header, arrays)
+
+    def save(self, path):
+        """Writes the snapshot to a temporary file, then renames it into place."""
+        header = dict(self.header, arrays={})
+        offset = 0
+        for name, array in self.arrays.items():
+            header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += -(-array.nbytes // ALIGN) * ALIGN
+        header_bytes = json.dumps(header, default=str).encode("utf-8")
+        data_start = -(-(len(MAGIC) + 8 + len(header_bytes)) // ALIGN) * ALIGN
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(np.uint64(len(header_bytes)).tobytes())
+            f.write(header_bytes)
+            for name, array in self.arrays.items():
+                f.seek(data_start + header["arrays"][name]["offset"])
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+
+    # -------------------------------------------------
+    #  Loading
+    # -------------------------------------------------
+    @classmethod
+    def load(cls, path, source_hash=None):
+        """
+        Maps a snapshot saved with save() (copy-on-write, nothing is read up front).
+        Returns None if the file is missing, not a snapshot of this version, or
+        (when source_hash is given) built from a different source file.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            try:
+                header = json.loads(f.read(size))
+            except ValueError:
+                return None
+        if source_hash is not None and header.get("source_hash") != source_hash:
+            return None             # Stale: checked before anything is mapped
+        data_start = -(-(len(MAGIC) + 8 + size) // ALIGN) * ALIGN
+        arrays = {}
+        for name, spec in header.pop("arrays").items():
+            shape = tuple(spec["shape"])
+            if 0 in shape:
+                arrays[name] = np.empty(shape, dtype=spec["dtype"])
+            else:
+                arrays[name] = np.memmap(path, dtype=spec["dtype"], mode="c",
+                                         offset=data_start + spec["offset"], shape=shape)
+        return cls(header, arrays)
+
+    def stars(self):
+        """Star objects in dense order."""
+        a = self.arrays
+        n = self.header["n_stars"]
+        ids = self.header["ids"] if self.header["ids"] is not None else a["ids"].tolist()
+        names = bytes(a["names"]).decode("utf-8").split("\x00") if n else []
+        galaxies = self.header["galaxies"]
+        return [
+            Star(sid, name, x, y, galaxy=galaxies[g], is_hypergiant=h,
+                 life_delta=ld, investigation_time=it, energy_cost=ec)
+            for sid, name, x, y, g, h, ld, it, ec in zip(
+                ids, names, a["x"].tolist(), a["y"].tolist(), a["galaxy"].tolist(),
+                a["hypergiant"].tolist(), a["life_delta"].tolist(),
+                a["investigation_time"].tolist(), a["energy_cost"].tolist())
+        ]
+
+    def frozen_graph(self, ids=None):
+        """The connections as a FrozenGraph backed by the mapped CSR arrays."""
+        if ids is None:
+            ids = self.header["ids"] if self.header["ids"] is not None else self.arrays["ids"].tolist()
+        return FrozenGraph(ids, self.arrays["indptr"], self.arrays["indices"], self.arrays["weights"])
+
+    def populate(self, graph):
+        """
+        Adds the snapshot's stars, connections and constellations to graph; returns
+        the constellations. An empty graph is left frozen on the mapped connections.
+        """
+        # Only new, acyclic objects are created here: skip the cyclic GC passes
+        # that millions of allocations would otherwise trigger
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._populate(graph)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _populate(self, graph):
+        stars = self.stars()
+        ids = [star.id for star in stars]
+
+        members = self.arrays["members"].tolist()
+        member_ptr = self.arrays["member_ptr"].tolist()
+        edges = self.arrays["edges"].tolist()
+        edge_weights = self.arrays["edge_weights"].tolist()
+        edge_ptr = self.arrays["edge_ptr"].tolist()
+        constellations = []
+        for k, (name, color) in enumerate(self.header["constellations"]):
+            const = Constellation(name, color)
+            const.stars = [stars[i] for i in members[member_ptr[k]:member_ptr[k + 1]]]
+            const.edges = [(ids[u], ids[v], w) for (u, v), w in
+                           zip(edges[edge_ptr[k]:edge_ptr[k + 1]], edge_weights[edge_ptr[k]:edge_ptr[k + 1]])]
+            constellations.append(const)
+
+        # The mapped CSR arrays become the graph's frozen snapshot as they are;
+        # adjacency dicts are only built if a mutation thaws the graph
+        graph.bulk_load(stars, self.frozen_graph(ids), constellations)
+        graph.collapsed_duplicates += self.header["collapsed_duplicates"]
+        return constellations
+
+    def __repr__(self):
+        return (f"GalaxySnapshot(stars={self.header['n_stars']}, "
+                f"edges={len(self.arrays['indices'])}, source={self.source_hash[:12]})")
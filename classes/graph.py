@@ -1,17 +1,72 @@
+import hashlib
+import heapq
 import math
+from collections import deque
+from .connectivity import ConnectivityIndex
 from .constellation import Constellation
+from .path_cache import ShortestPathCache
+from .spatial_index import SpatialIndex
 from .star import Star
 
+class NegativeCycleError(Exception):
+    """Raised when a shortest-path query finds a negative weight cycle."""
+
+    def __init__(self, cycle):
+        super().__init__(f"Negative weight cycle detected: {cycle}")
+        self.cycle = cycle
+
+
+def find_cycle(pred, node, n):
+    """
+    Returns the cycle reachable backwards from node in a predecessor map.
+    Walking n steps first guarantees we are standing on the cycle itself.
+    """
+    for _ in range(n):
+        node = pred[node]
+    cycle = [node]
+    current = pred[node]
+    while current != node:
+        cycle.append(current)
+        current = pred[current]
+    cycle.reverse()
+    return cycle
+
+
 class Graph:
     """
     Represents the entire galaxy graph containing multiple constellations.
     Manages all stars and the bidirectional connections between them.
     """
 
-    def __init__(self):
+    def __init__(self, path_cache_size=32):
         self.nodes = {}             # {star_id: Star}
-        self.adjacency = {}         # {star_id: [(neighbor_id, distance), ...]}
+        self.adjacency = {}         # {star_id: {neighbor_id: distance}}
         self.constellations = []    # List of Constellation objects
+        self.frozen = None          # FrozenGraph (CSR) snapshot, see freeze()
+        self._adjacency_released = False
+        self.distance_cache = None  # DistanceCache, built on first shortest_distance()
+        self.dynamic_trees = {}     # {source_id: DynamicShortestPaths}
+        self.last_query_stats = {}  # {"algorithm": ..., "expanded": ...} of the last route query
+        self._astar_scale = None    # Cached heuristic scale for astar(), None = not computed
+        self.contraction_hierarchy = None  # ContractionHierarchy, see prepare_contraction_hierarchy()
+        self.version = 0            # Bumped by every mutation
+        self.topology_version = 0   # Bumped when stars are added or connections change
+        self.path_cache = ShortestPathCache(path_cache_size)
+        self.collapsed_duplicates = 0  # add_edge calls merged into an existing connection
+        self.spatial_index = SpatialIndex()  # Grid over Star x/y, see nearest_stars()
+        self.connectivity = None    # ConnectivityIndex, built on first reachability query
+
+    def __getstate__(self):
+        """
+        Pickles stars, connections and the frozen snapshot only (e.g. when the graph
+        is sent to worker processes); caches and tracked trees are rebuilt lazily.
+        """
+        state = self.__dict__.copy()
+        state["distance_cache"] = None
+        state["dynamic_trees"] = {}
+        state["connectivity"] = None
+        state["path_cache"] = ShortestPathCache(self.path_cache.maxsize)
+        return state
 
     # -----------------------------
     #  Add / Remove elements
@@ -21,8 +76,12 @@ class Graph:
         Adds a star (node) to the graph.
         Each star is stored in the nodes dictionary using its ID as the key.
         """
+        self._thaw_for_mutation()
+        self._star_added()
         self.nodes[star.id] = star
-        
+        self.spatial_index.insert(star.id, star.x, star.y)
+        self._notify_node_added(star.id)
+
     def add_constellation(self, constellation):
         """Adds a new constellation to the graph."""
         if isinstance(constellation, Constellation):
@@ -32,32 +91,101 @@ class Graph:
             for origin, dest, dist in constellation.edges:
                 self.add_edge(origin, dest, dist)
 
+    def bulk_load(self, stars, adjacency, constellations=()):
+        """
+        Fills the graph in one step from Star objects and a symmetric adjacency
+        dict {star_id: {neighbor_id: distance}}, or a FrozenGraph (e.g. mapped
+        from a GalaxySnapshot).
+        An empty graph takes them as they are; a FrozenGraph becomes its frozen
+        snapshot with the adjacency dict released until thaw(). Otherwise they
+        are merged with add_node() / add_edge().
+        """
+        from .frozen_graph import FrozenGraph
+
+        frozen = adjacency if isinstance(adjacency, FrozenGraph) else None
+        if self.nodes or self.adjacency:
+            if frozen is not None:
+                adjacency = frozen.to_adjacency()
+            for star in stars:
+                self.add_node(star)
+            done = set()
+            for origin, edges in adjacency.items():
+                for dest, distance in edges.items():
+                    if dest not in done:
+                        self.add_edge(origin, dest, distance)
+                done.add(origin)
+        else:
+            self._thaw_for_mutation()
+            self._topology_changed()
+            self.nodes = {star.id: star for star in stars}
+            if frozen is not None:
+                self.adjacency = {}
+                self.frozen = frozen
+                self._adjacency_released = True
+            else:
+                self.adjacency = adjacency
+            self.connectivity = None
+            self.dynamic_trees.clear()
+            self.rebuild_spatial_index()
+        self.constellations.extend(constellations)
+
     def add_node(self, star):
         """Adds a new star node to the graph."""
         if isinstance(star, Star):
+            self._thaw_for_mutation()
+            self._star_added()
             self.nodes[star.id] = star
+            self.spatial_index.insert(star.id, star.x, star.y)
             if star.id not in self.adjacency:
-                self.adjacency[star.id] = []
+                self.adjacency[star.id] = {}
+            self._notify_node_added(star.id)
 
     def add_edge(self, origin_id, dest_id, distance):
-        """Adds a bidirectional connection between two stars."""
-        if origin_id not in self.adjacency:
-            self.adjacency[origin_id] = []
-        if dest_id not in self.adjacency:
-            self.adjacency[dest_id] = []
-        self.adjacency[origin_id].append((dest_id, distance))
-        self.adjacency[dest_id].append((origin_id, distance))
+        """
+        Adds a bidirectional connection between two stars.
+        Parallel connections are collapsed into one that keeps the minimum distance;
+        collapsed_duplicates counts how many add_edge calls were merged this way.
+        """
+        current = self.edge_distance(origin_id, dest_id)
+        if current is not None:
+            self.collapsed_duplicates += 1
+            if current <= distance:
+                return
+        self._thaw_for_mutation()
+        self._topology_changed()
+        self._append_adjacency(origin_id, dest_id, distance)
+        self._notify_edge_inserted(origin_id, dest_id, distance)
 
     def remove_edge(self, origin_id, dest_id):
         """Removes a connection between two stars (both directions)."""
-        if origin_id in self.adjacency:
-            self.adjacency[origin_id] = [
-                (nid, d) for nid, d in self.adjacency[origin_id] if nid != dest_id
-            ]
-        if dest_id in self.adjacency:
-            self.adjacency[dest_id] = [
-                (nid, d) for nid, d in self.adjacency[dest_id] if nid != origin_id
-            ]
+        self._thaw_for_mutation()
+        self._topology_changed()
+        self._remove_adjacency(origin_id, dest_id)
+        self._notify_edge_removed(origin_id, dest_id)
+
+    def _append_adjacency(self, origin_id, dest_id, distance):
+        self.adjacency.setdefault(origin_id, {})[dest_id] = distance
+        self.adjacency.setdefault(dest_id, {})[origin_id] = distance
+
+    def _remove_adjacency(self, origin_id, dest_id):
+        self.adjacency.get(origin_id, {}).pop(dest_id, None)
+        self.adjacency.get(dest_id, {}).pop(origin_id, None)
+
+    def update_star(self, star_id, **new_data):
+        """
+        Updates a star's attributes (energy_cost, x/y, ...) and bumps the version.
+        Distances do not depend on them, so the distance caches and the
+        contraction hierarchy are kept; moving a star only resets the A* scale.
+        """
+        star = self.nodes.get(star_id)
+        if star is None:
+            return None
+        self._graph_changed()
+        star.update_data(**new_data)
+        if "x" in new_data or "y" in new_data:
+            self._astar_scale = None
+            self.spatial_index.insert(star_id, star.x, star.y)
+        return star
 
     # -----------------------------
     #  Utility methods
@@ -66,23 +194,261 @@ class Graph:
         """Returns a star object by ID."""
         return self.nodes.get(star_id, None)
 
+    def nearest_stars(self, x, y, k=1, max_distance=math.inf):
+        """IDs of the k stars closest to (x, y), nearest first."""
+        return [sid for _, sid in self.spatial_index.nearest(x, y, k, max_distance)]
+
+    def stars_in_rect(self, x_min, y_min, x_max, y_max):
+        """IDs of the stars inside the rectangle (coordinates in galaxy units)."""
+        return self.spatial_index.in_rect(x_min, y_min, x_max, y_max)
+
+    def rebuild_spatial_index(self, cell_size=None):
+        """Rebuilds the spatial index, picking a cell size that fits the current stars."""
+        self.spatial_index = SpatialIndex.from_stars(self.nodes.values(), cell_size)
+        return self.spatial_index
+
     def get_neighbors(self, star_id):
-        """Returns the list of neighbors for a star."""
-        return self.adjacency.get(star_id, [])
+        """Returns the (neighbor_id, distance) pairs of a star."""
+        if self._adjacency_released:
+            return self.frozen.neighbors(star_id)
+        return self.adjacency.get(star_id, {}).items()
+
+    def edge_distance(self, origin_id, dest_id):
+        """Returns the distance of the direct connection origin -> dest, or None."""
+        if self._adjacency_released:
+            return dict(self.frozen.neighbors(origin_id)).get(dest_id)
+        return self.adjacency.get(origin_id, {}).get(dest_id)
 
     def block_path(self, origin_id, dest_id):
-        """Temporarily blocks a path (used for meteor or comet events)."""
+        """
+        Temporarily blocks a path (used for meteor or comet events).
+        On a frozen graph the CSR edges are masked instead of thawing.
+        """
+        if self.frozen is not None:
+            self._topology_changed()
+            self.frozen.block(origin_id, dest_id)
+            if not self._adjacency_released:
+                self._remove_adjacency(origin_id, dest_id)
+            self._notify_edge_removed(origin_id, dest_id)
+            return
         self.remove_edge(origin_id, dest_id)
 
     def unblock_path(self, origin_id, dest_id, distance):
-        """Restores a previously blocked path."""
+        """
+        Restores a previously blocked path.
+        On a frozen graph the CSR mask is lifted; unknown edges thaw the graph.
+        """
+        if self.frozen is not None and self.frozen.unblock(origin_id, dest_id, distance):
+            self._topology_changed()
+            if not self._adjacency_released:
+                self._remove_adjacency(origin_id, dest_id)
+                self._append_adjacency(origin_id, dest_id, distance)
+            # The restored distance may differ from the old one in either direction
+            self._notify_edge_removed(origin_id, dest_id)
+            self._notify_edge_inserted(origin_id, dest_id, distance)
+            return
         self.add_edge(origin_id, dest_id, distance)
 
+    # -----------------------------
+    #  Frozen (CSR) representation
+    # -----------------------------
+    def freeze(self, keep_adjacency=True):
+        """
+        Builds a compact CSR snapshot (NumPy indptr/indices/weights arrays) that the
+        shortest-path algorithms use while the graph is frozen.
+        With keep_adjacency=False the adjacency dict is released to save memory;
+        it is rebuilt by thaw(), which any structural mutation triggers automatically.
+        """
+        from .frozen_graph import FrozenGraph
+
+        if self.frozen is None:
+            self.frozen = FrozenGraph.from_graph(self)
+        if not keep_adjacency and not self._adjacency_released:
+            self.adjacency = {}
+            self._adjacency_released = True
+        return self.frozen
+
+    def thaw(self):
+        """Drops the CSR snapshot, restoring the adjacency dict if it was released."""
+        if self.frozen is None:
+            return
+        if self._adjacency_released:
+            self.adjacency = self.frozen.to_adjacency()
+            self._adjacency_released = False
+        self.frozen = None
+
+    def _thaw_for_mutation(self):
+        if self.frozen is not None:
+            self.thaw()
+
+    def _graph_changed(self):
+        """Bumps the version after any mutation (star attributes included)."""
+        self.version += 1
+
+    def _star_added(self):
+        """
+        A new (still unconnected) star: cached distances between the existing
+        stars stay valid, and the caches treat unknown stars as isolated.
+        Replacing a star may move it, so the A* scale is recomputed.
+        """
+        self._graph_changed()
+        self.topology_version += 1
+        self._astar_scale = None
+
+    def _topology_changed(self):
+        """Connections or their distances changed: drops everything derived from them."""
+        self._graph_changed()
+        self.topology_version += 1
+        if self.distance_cache is not None:
+            self.distance_cache.invalidate()
+        self._astar_scale = None
+        self.contraction_hierarchy = None
+
+    def _notify_node_added(self, star_id):
+        if self.connectivity is not None:
+            self.connectivity.node_added(star_id)
+        for tree in self.dynamic_trees.values():
+            tree.node_added(star_id)
+
+    def _notify_edge_inserted(self, origin_id, dest_id, distance):
+        if self.connectivity is not None:
+            self.connectivity.edge_inserted(origin_id, dest_id)
+        for tree in self.dynamic_trees.values():
+            tree.edge_inserted(origin_id, dest_id, distance)
+
+    def _notify_edge_removed(self, origin_id, dest_id):
+        if self.connectivity is not None:
+            self.connectivity.edge_removed(origin_id, dest_id)
+        for tree in self.dynamic_trees.values():
+            tree.edge_removed(origin_id, dest_id)
+
+    # -----------------------------
+    #  Connected components
+    # -----------------------------
+    def connectivity_index(self):
+        """Returns the ConnectivityIndex, building it with union-find on first use."""
+        if self.connectivity is None:
+            self.connectivity = ConnectivityIndex(self)
+        return self.connectivity
+
+    def is_reachable(self, origin_id, dest_id):
+        """True if some path connects the two stars (blocked paths excluded)."""
+        return self.connectivity_index().is_reachable(origin_id, dest_id)
+
+    def reachable_stars(self, star_id):
+        """Set of star IDs in the same connected component as star_id."""
+        return self.connectivity_index().component(star_id)
+
+    def is_split(self):
+        """True if the galaxy falls apart into more than one component."""
+        return self.connectivity_index().is_split()
+
+    # -----------------------------
+    #  Versioned shortest-path cache
+    # -----------------------------
+    def cached_shortest_paths(self, source_id, algorithm="dijkstra"):
+        """
+        Returns (dist, pred) from source_id, reusing the LRU entry for
+        (source_id, algorithm, topology_version) when no star or connection has
+        been added or changed since.
+        algorithm is "dijkstra" or "bellman_ford". The returned dicts are shared
+        with the cache and must not be modified.
+        """
+        key = (source_id, algorithm, self.topology_version)
+        cached = self.path_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if algorithm == "dijkstra":
+            dist, pred, _ = self.dijkstra(source_id)
+        elif algorithm == "bellman_ford":
+            dist, pred = self.bellman_ford(source_id, engine="queue")
+        else:
+            raise ValueError(f"Unknown algorithm: {algorithm!r}")
+        self.path_cache.put(key, (dist, pred))
+        return dist, pred
+
+    def cache_stats(self):
+        """Statistics of the graph's caches, for display in the UI."""
+        stats = {"version": self.version, "path_cache": self.path_cache.stats()}
+        if self.distance_cache is not None:
+            stats["distance_cache"] = self.distance_cache.stats()
+        return stats
+
+    # -----------------------------
+    #  Incrementally repaired shortest-path trees
+    # -----------------------------
+    def track_shortest_paths(self, source_id):
+        """
+        Returns the DynamicShortestPaths tree of source_id, creating it if needed.
+        Tracked trees are repaired incrementally on every edge mutation.
+        """
+        tree = self.dynamic_trees.get(source_id)
+        if tree is None:
+            from .dynamic_sssp import DynamicShortestPaths
+            tree = DynamicShortestPaths(self, source_id)
+            self.dynamic_trees[source_id] = tree
+        return tree
+
+    def untrack_shortest_paths(self, source_id):
+        """Stops repairing the tree of source_id."""
+        self.dynamic_trees.pop(source_id, None)
+
+    def shortest_path_tree(self, source_id):
+        """Returns (dist, pred) from source_id, reusing the tracked tree if any."""
+        return self.track_shortest_paths(source_id).tree()
+
+    # -----------------------------
+    #  All-pairs distance cache
+    # -----------------------------
+    def shortest_distance(self, origin_id, dest_id):
+        """
+        Returns the shortest distance between two stars (math.inf if unreachable),
+        served from a lazily built, memory-bounded all-pairs cache.
+        """
+        return self._get_distance_cache().distance(origin_id, dest_id)
+
+    def distance_matrix(self, star_ids):
+        """NumPy matrix of shortest distances between star_ids, from the same cache."""
+        return self._get_distance_cache().matrix_for(star_ids)
+
+    def _get_distance_cache(self):
+        if self.distance_cache is None:
+            from .distance_cache import DistanceCache
+            self.distance_cache = DistanceCache(self)
+        return self.distance_cache
+
     # ============================================================
     #  BELLMAN-FORD Algorithm
     # ============================================================
-    def bellman_ford(self, start_id):
-        """Computes the shortest paths from start_id using Bellman-Ford."""
+    BELLMAN_FORD_ENGINES = ("classic", "vectorized", "queue")
+
+    def bellman_ford(self, start_id, engine="classic"):
+        """
+        Computes the shortest paths from start_id using Bellman-Ford.
+        Returns (dist, pred) dicts keyed by star ID.
+
+        engine selects the implementation:
+          - "classic":    V-1 passes over every adjacency dict; prints a warning and
+                          returns (None, None) on a negative cycle
+          - "vectorized": relaxes all edges per pass with NumPy array operations
+          - "queue":      SPFA, only re-relaxes stars whose distance changed
+        The "vectorized" and "queue" engines raise NegativeCycleError, whose
+        cycle attribute lists the star IDs of the offending cycle.
+        """
+        if engine == "classic":
+            return self._bellman_ford_classic(start_id)
+        if engine == "vectorized":
+            return self._bellman_ford_vectorized(start_id)
+        if engine == "queue":
+            return self._bellman_ford_queue(start_id)
+        raise ValueError(f"Unknown Bellman-Ford engine: {engine!r}")
+
+    def _bellman_ford_classic(self, start_id):
+        """Original pass-based Bellman-Ford."""
+        if self.frozen is not None:
+            return self.frozen.bellman_ford(start_id)
+
         dist = {v: math.inf for v in self.nodes}
         pred = {v: None for v in self.nodes}
         dist[start_id] = 0
@@ -92,7 +458,7 @@ class Graph:
         for _ in range(len(self.nodes) - 1):
             updated = False
             for u in self.nodes:
-                for v, weight in self.adjacency.get(u, []):
+                for v, weight in self.adjacency.get(u, {}).items():
                     if dist[u] + weight < dist[v]:
                         dist[v] = dist[u] + weight
                         pred[v] = u
@@ -102,18 +468,113 @@ class Graph:
 
         # Detect negative cycles
         for u in self.nodes:
-            for v, weight in self.adjacency.get(u, []):
+            for v, weight in self.adjacency.get(u, {}).items():
                 if dist[u] + weight < dist[v]:
                     print("Warning: Negative weight cycle detected.")
                     return None, None
 
         return dist, pred
 
+    def _bellman_ford_vectorized(self, start_id):
+        """Bellman-Ford on the CSR edge arrays (a temporary snapshot if not frozen)."""
+        from .frozen_graph import FrozenGraph
+
+        frozen = self.frozen if self.frozen is not None else FrozenGraph.from_graph(self)
+        return frozen.bellman_ford_vectorized(start_id)
+
+    def _bellman_ford_queue(self, start_id):
+        """
+        Queue-based Bellman-Ford (SPFA). A star is re-queued only when its distance
+        improves; a shortest path with V or more edges means a negative cycle.
+        """
+        dist = {v: math.inf for v in self.nodes}
+        pred = {v: None for v in self.nodes}
+        hops = {start_id: 0}
+        dist[start_id] = 0
+        pred[start_id] = start_id
+        n = max(len(self.nodes), 1)
+
+        queue = deque([start_id])
+        in_queue = {start_id}
+        while queue:
+            u = queue.popleft()
+            in_queue.discard(u)
+            du = dist[u]
+            for v, weight in self.get_neighbors(u):
+                if du + weight < dist.get(v, math.inf):
+                    dist[v] = du + weight
+                    pred[v] = u
+                    hops[v] = hops[u] + 1
+                    if hops[v] >= n:
+                        raise NegativeCycleError(find_cycle(pred, v, n))
+                    if v not in in_queue:
+                        in_queue.add(v)
+                        queue.append(v)
+
+        return dist, pred
+
     # ============================================================
     #  DIJKSTRA Algorithm
     # ============================================================
-    def dijkstra(self, start_id, target_id=None):
-        """Computes the shortest path(s) from start_id using Dijkstra."""
+    DIJKSTRA_ENGINES = ("heap", "linear")
+
+    def dijkstra(self, start_id, target_id=None, engine="heap"):
+        """
+        Computes the shortest path(s) from start_id using Dijkstra.
+        Returns (dist, pred, path); path is only built when target_id is given.
+
+        engine selects the implementation:
+          - "heap":   binary heap with lazy deletion, O((V + E) log V) (default)
+          - "linear": original version that scans every unvisited node, O(V²)
+        """
+        if engine == "heap" and self.frozen is not None:
+            dist, pred = self.frozen.dijkstra(start_id, target_id)
+            self.last_query_stats = {"algorithm": "dijkstra", "expanded": self.frozen.last_expanded}
+        elif engine == "heap":
+            dist, pred = self._dijkstra_heap(start_id, target_id)
+        elif engine == "linear":
+            dist, pred = self._dijkstra_linear(start_id, target_id)
+        else:
+            raise ValueError(f"Unknown Dijkstra engine: {engine!r}")
+
+        # Build shortest path if a target is given
+        path = []
+        if target_id is not None:
+            path = self._build_path(pred, target_id)
+
+        return dist, pred, path
+
+    def _dijkstra_heap(self, start_id, target_id=None):
+        """Heap-based Dijkstra; stale heap entries are skipped when popped."""
+        dist = {v: math.inf for v in self.nodes}
+        pred = {v: None for v in self.nodes}
+        dist[start_id] = 0
+        visited = set()
+        heap = [(0, start_id)]
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in visited or d > dist[u]:
+                continue
+
+            visited.add(u)
+            if u == target_id:
+                break
+
+            for v, weight in self.adjacency.get(u, {}).items():
+                if v in visited:
+                    continue
+                new_dist = d + weight
+                if new_dist < dist.get(v, math.inf):
+                    dist[v] = new_dist
+                    pred[v] = u
+                    heapq.heappush(heap, (new_dist, v))
+
+        self.last_query_stats = {"algorithm": "dijkstra", "expanded": len(visited)}
+        return dist, pred
+
+    def _dijkstra_linear(self, start_id, target_id=None):
+        """Original O(V²) Dijkstra, kept for comparison and benchmarks."""
         dist = {v: math.inf for v in self.nodes}
         pred = {v: None for v in self.nodes}
         dist[start_id] = 0
@@ -125,26 +586,242 @@ class Graph:
                 break
 
             unvisited.remove(u)
-            if target_id and u == target_id:
+            if u == target_id:
                 break
 
-            for v, weight in self.adjacency.get(u, []):
+            for v, weight in self.get_neighbors(u):
                 if v in unvisited:
                     new_dist = dist[u] + weight
                     if new_dist < dist[v]:
                         dist[v] = new_dist
                         pred[v] = u
 
-        # Build shortest path if a target is given
-        path = []
-        if target_id:
-            current = target_id
-            while current is not None:
-                path.insert(0, current)
-                current = pred[current]
+        return dist, pred
+
+    def bounded_distances(self, start_id, cutoff=math.inf, max_settled=None):
+        """
+        Dijkstra that only explores the neighbourhood of start_id: it stops at
+        stars farther than cutoff or after max_settled stars.
+        Returns {star_id: distance} of the settled stars, nearest first.
+        """
+        settled = {}
+        dist = {start_id: 0}
+        heap = [(0, start_id)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in settled or d > dist[u]:
+                continue
+            if d > cutoff:
+                break
+            settled[u] = d
+            if max_settled is not None and len(settled) >= max_settled:
+                break
+            for v, weight in self.get_neighbors(u):
+                new_dist = d + weight
+                if v not in settled and new_dist < dist.get(v, math.inf):
+                    dist[v] = new_dist
+                    heapq.heappush(heap, (new_dist, v))
+        return settled
 
+    # ============================================================
+    #  Bidirectional Dijkstra
+    # ============================================================
+    def bidirectional_dijkstra(self, start_id, target_id):
+        """
+        Single-pair shortest path searching from both ends at once.
+        Stops as soon as the two frontier minimums add up to at least the best
+        start -> target distance found so far.
+
+        Returns (dist, pred, path) like dijkstra(); dist/pred cover the stars the
+        forward search reached plus the stars of the final path.
+        """
+        searches = (
+            ({start_id: 0}, {start_id: None}, [(0, start_id)], set()),
+            ({target_id: 0}, {target_id: None}, [(0, target_id)], set()),
+        )
+        best = 0 if start_id == target_id else math.inf
+        meet = start_id if start_id == target_id else None
+
+        while searches[0][2] and searches[1][2]:
+            if searches[0][2][0][0] + searches[1][2][0][0] >= best:
+                break
+            # Expand the side whose frontier is closer
+            side = 0 if searches[0][2][0][0] <= searches[1][2][0][0] else 1
+            dist, pred, heap, settled = searches[side]
+            other_dist = searches[1 - side][0]
+
+            d, u = heapq.heappop(heap)
+            if u in settled or d > dist[u]:
+                continue
+            settled.add(u)
+
+            for v, weight in self.get_neighbors(u):
+                new_dist = d + weight
+                if new_dist < dist.get(v, math.inf):
+                    dist[v] = new_dist
+                    pred[v] = u
+                    heapq.heappush(heap, (new_dist, v))
+                if v in other_dist and new_dist + other_dist[v] < best:
+                    best = new_dist + other_dist[v]
+                    meet = v
+
+        dist_f, pred_f = dict(searches[0][0]), dict(searches[0][1])
+        dist_b, pred_b = searches[1][0], searches[1][1]
+        if meet is not None:
+            # Splice the backward half of the route onto the forward tree
+            current = meet
+            while current != target_id:
+                nxt = pred_b[current]
+                pred_f[nxt] = current
+                dist_f[nxt] = best - dist_b[nxt]
+                current = nxt
+
+        self.last_query_stats = {
+            "algorithm": "bidirectional",
+            "expanded": len(searches[0][3]) + len(searches[1][3]),
+        }
+        return dist_f, pred_f, self._build_path(pred_f, target_id)
+
+    # ============================================================
+    #  A* Algorithm
+    # ============================================================
+    def astar(self, start_id, target_id):
+        """
+        Point-to-point shortest path guided by the stars' x/y coordinates.
+        The heuristic is scale * euclidean distance to the target, where scale is the
+        smallest distance / euclidean ratio over all edges, so it never overestimates
+        and stays consistent. When no positive scale exists (missing coordinates,
+        negative or zero-length edges between distinct points) it falls back to Dijkstra.
+
+        Returns (dist, pred, path) like dijkstra(), except that dist/pred only hold
+        the stars the search actually reached. Nodes expanded are in last_query_stats.
+        """
+        scale = self._heuristic_scale()
+        target = self.nodes.get(target_id)
+        if scale <= 0 or target is None:
+            dist, pred, path = self.dijkstra(start_id, target_id)
+            self.last_query_stats["algorithm"] = "dijkstra (A* fallback)"
+            return dist, pred, path
+
+        tx, ty = target.x, target.y
+        nodes = self.nodes
+
+        def heuristic(star_id):
+            star = nodes[star_id]
+            return scale * math.hypot(star.x - tx, star.y - ty)
+
+        dist = {start_id: 0}
+        pred = {start_id: None}
+        closed = set()
+        heap = [(heuristic(start_id), 0, start_id)]
+
+        while heap:
+            _, d, u = heapq.heappop(heap)
+            if u in closed or d > dist[u]:
+                continue
+            closed.add(u)
+            if u == target_id:
+                break
+
+            for v, weight in self.get_neighbors(u):
+                new_dist = d + weight
+                if v not in closed and new_dist < dist.get(v, math.inf):
+                    dist[v] = new_dist
+                    pred[v] = u
+                    heapq.heappush(heap, (new_dist + heuristic(v), new_dist, v))
+
+        self.last_query_stats = {"algorithm": "astar", "expanded": len(closed)}
+        path = self._build_path(pred, target_id)
         return dist, pred, path
 
+    def _heuristic_scale(self):
+        """
+        Largest factor k such that k * euclidean(u, v) <= distance(u, v) for every
+        edge, or 0 when the coordinates cannot give a useful lower bound.
+        Cached until the graph changes.
+        """
+        if self._astar_scale is not None:
+            return self._astar_scale
+
+        scale = math.inf
+        for u in list(self.nodes) if self._adjacency_released else list(self.adjacency):
+            su = self.nodes.get(u)
+            for v, weight in self.get_neighbors(u):
+                sv = self.nodes.get(v)
+                if su is None or sv is None or weight < 0:
+                    scale = 0
+                    break
+                try:
+                    euclid = math.hypot(su.x - sv.x, su.y - sv.y)
+                except TypeError:
+                    scale = 0
+                    break
+                if euclid > 0:
+                    scale = min(scale, weight / euclid)
+            if scale == 0:
+                break
+
+        self._astar_scale = 0 if scale == math.inf else scale
+        return self._astar_scale
+
+    @staticmethod
+    def _build_path(pred, target_id):
+        """Walks the predecessor map back from target_id to the source."""
+        path = []
+        current = target_id
+        seen = set()
+        while current is not None and current not in seen:
+            seen.add(current)
+            path.append(current)
+            current = pred.get(current)
+        path.reverse()
+        return path
+
+    # ============================================================
+    #  Contraction hierarchy
+    # ============================================================
+    def content_hash(self):
+        """SHA-256 of the stars and (unblocked) connections, independent of insertion order."""
+        digest = hashlib.sha256()
+        for sid in sorted(self.nodes, key=repr):
+            digest.update(f"{sid!r}|".encode())
+            for nid, d in sorted(self.get_neighbors(sid), key=lambda e: (repr(e[0]), e[1])):
+                digest.update(f"{nid!r}:{float(d)!r};".encode())
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def prepare_contraction_hierarchy(self, cache_path=None):
+        """
+        Builds the contraction hierarchy used by ch_route().
+        With cache_path, a saved hierarchy is reused when its content hash still
+        matches the graph; otherwise it is rebuilt and saved there.
+        """
+        from .contraction_hierarchy import ContractionHierarchy
+
+        current_hash = self.content_hash()
+        hierarchy = ContractionHierarchy.load(cache_path) if cache_path else None
+        if hierarchy is None or hierarchy.content_hash != current_hash:
+            hierarchy = ContractionHierarchy.build(self)
+            if cache_path:
+                hierarchy.save(cache_path)
+        self.contraction_hierarchy = hierarchy
+        return hierarchy
+
+    def ch_route(self, start_id, target_id):
+        """
+        Point-to-point (distance, path) from the contraction hierarchy.
+        Connection changes drop the hierarchy; until it is prepared again the
+        query falls back to bidirectional Dijkstra. Stars added after it was
+        built are isolated until they get a connection.
+        """
+        if start_id == target_id and start_id in self.nodes:
+            return 0, [start_id]
+        if self.contraction_hierarchy is None:
+            dist, _, path = self.bidirectional_dijkstra(start_id, target_id)
+            distance = dist.get(target_id, math.inf)
+            return distance, path if distance < math.inf else []
+        return self.contraction_hierarchy.query(start_id, target_id)
+
     # -----------------------------
     #  Representation
     # -----------------------------
@@ -1,18 +1,50 @@
 import json
-from tkinter import filedialog
+import math
+import os
+import time
 from .constellation import Constellation
 from .star import Star
 from .donkey import Donkey
+from .write_behind import WriteBehindPersister
+from .json_stream import JsonStreamReader
+from .mutation_journal import MutationJournal
 
 class JsonManager:
     """
     Handles loading and saving constellation data from/to JSON files.
-    Keeps the file synchronized with any runtime modifications.
+    Keeps the file synchronized with any runtime modifications: save_json()
+    takes a plain-dict copy of the graph on the calling thread and a background
+    writer dumps the latest copy at most once every write_delay seconds
+    (write_delay=None writes immediately). The writer never reads the live graph.
+
+    With snapshots=True, load_path() keeps a binary GalaxySnapshot next to the
+    JSON (<file>.snap) and maps it instead of parsing when the JSON's SHA-256
+    still matches; a stale or missing snapshot is rebuilt after parsing.
+
+    Edits made through update_star(), update_connection(), block_path() and
+    unblock_path() are appended to a MutationJournal (<file>.journal) instead
+    of rewriting the file, and replayed on the next load. Once the journal
+    holds journal_limit records the file is rewritten (compacted) in the
+    background; every full write empties the journal. Full writes start from
+    the current file and only change what differs in the graph, so keys and
+    records the loader ignores survive compaction.
+    journal_limit=None saves every edit with save_json() instead.
     """
 
-    def __init__(self, graph=None):
+    def __init__(self, graph=None, write_delay=1.0, snapshots=True, journal_limit=1000):
         self.graph = graph
         self.file_path = None
+        self.write_delay = write_delay
+        self.persister = None        # WriteBehindPersister, created on the first save
+        self._dirty_graph = None     # Graph of the last save_json()
+        self._pending = None         # (file dict, journal records it includes) to write next
+        self._saved_version = None   # (graph, version) already captured in _pending
+        self.load_report = None      # Summary and validation problems of the last load
+        self.fields = {}             # Top-level JSON members besides the constellations
+        self.snapshots = snapshots
+        self.loaded_from_snapshot = False
+        self.journal_limit = journal_limit
+        self.journal = None          # MutationJournal of the loaded file
 
     # -------------------------------------------------
     #  Load and Save
@@ -22,6 +54,8 @@ class JsonManager:
         Opens a file dialog for the user to select a JSON file,
         reads it, fills the existing graph, and returns constellations.
         """
+        from tkinter import filedialog   # Only the dialog needs Tk; loading is headless
+
         self.file_path = filedialog.askopenfilename(
             title="Select constellation JSON file",
             filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
@@ -31,92 +65,453 @@ class JsonManager:
             print("No file selected.")
             return []
 
-        with open(self.file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        return self.load_path(self.file_path)
+
+    def load_path(self, file_path):
+        """
+        Reads a constellation JSON file without any dialog, fills the existing
+        graph and returns the constellations (see load_stream()).
+        Uses or refreshes the binary snapshot when snapshots are enabled, then
+        replays the file's edit journal over the graph.
+        """
+        constellations = self._load_base(file_path)
+        self._open_journal(file_path)
+        return constellations
+
+    def _open_journal(self, file_path):
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = MutationJournal(f"{file_path}.journal")
+        if self.graph is None:
+            return
+        replayed = self.journal.replay(self.graph)
+        if self.load_report is not None:
+            self.load_report["journal"] = replayed
+        if replayed["applied"] or replayed["skipped"]:
+            print(f"Replayed {replayed['applied']} journaled edits "
+                  f"({replayed['skipped']} unreadable records skipped).")
 
+    def _load_base(self, file_path):
+        """Loads the base JSON (or its snapshot) without the journal."""
+        self.loaded_from_snapshot = False
+        use_snapshot = self.snapshots and self.graph is not None
+        if use_snapshot:
+            try:
+                from .galaxy_snapshot import GalaxySnapshot, file_hash
+            except ImportError:      # NumPy not installed: always parse the JSON
+                use_snapshot = False
+        if use_snapshot:
+            source_hash = file_hash(file_path)
+            snapshot = GalaxySnapshot.load(f"{file_path}.snap", source_hash)
+            if snapshot is not None:
+                return self._load_snapshot(snapshot, file_path)
+            # Only a graph holding nothing but this file can be snapshotted
+            use_snapshot = not self.graph.nodes
+
+        with open(file_path, "rb") as f:
+            constellations = self.load_stream(f, file_path)
+
+        if use_snapshot:
+            try:
+                GalaxySnapshot.from_graph(self.graph, source_hash, self.fields,
+                                          self.load_report).save(f"{file_path}.snap")
+            except (OSError, ValueError) as error:
+                print(f"⚠️ Could not write the galaxy snapshot: {error}")
+        return constellations
+
+    def _load_snapshot(self, snapshot, file_path):
+        self.flush()                 # Pending changes belong to the previous file
+        self.file_path = file_path
+        started = time.perf_counter()
+        constellations = snapshot.populate(self.graph)
+        self.fields = snapshot.header["fields"]
+        self._set_donkey()
+        self.load_report = dict(snapshot.header["load_report"] or self._new_report(),
+                                elapsed=time.perf_counter() - started)
+        self.loaded_from_snapshot = True
+        print(f"=== Graph Loaded from snapshot: {len(self.graph.nodes)} stars, "
+              f"{self.graph.collapsed_duplicates} duplicate connections collapsed ===")
+        return constellations
+
+    def load_file(self, file_path):
+        """Same as load_path()."""
+        return self.load_path(file_path)
+
+    def load_stream(self, fileobj, file_path=None):
+        """
+        Parses constellations one at a time from a file object (text or binary)
+        and adds their stars and connections straight to the graph in one pass,
+        so the raw JSON tree of the whole galaxy is never held in memory.
+
+        A star listed in several constellations is one shared Star object.
+        Problems are skipped and summarized in self.load_report: stars with
+        missing or malformed fields, repeated ids whose label or coordinates
+        differ (the first record wins), invalid distances or self-links, and
+        linkedTo references to ids that never appear in the file (dangling).
+        """
+        self.flush()                 # Pending changes belong to the previous file
+        if file_path is not None:
+            self.file_path = file_path
+        started = time.perf_counter()
+        report = self._new_report()
+        stars = {}                   # {star_id: Star} of this file
+        pending = []                 # Links to ids not seen yet: (constellation, origin, dest, distance)
         constellations = []
-        for c in data.get("constellations", []):
-            const = Constellation(c["name"], c.get("color", "#FFFFFF"))
-
-            # Crear estrellas
-            for s in c.get("starts", []):
-                star = Star(
-                    s["id"], s["label"], s["coordenates"]["x"], s["coordenates"]["y"],
-                    galaxy=s.get("galaxy"),
-                    is_hypergiant=s.get("hypergiant", False),
-                    life_delta=s.get("timeToEat", 0),
-                    investigation_time=s.get("timeToEat", 0),
-                    energy_cost=s.get("amountOfEnergy", 0)
-                )
-                const.add_star(star)
-                if hasattr(self, "graph") and self.graph:
-                    self.graph.add_star(star)
+        fields = {}                  # Other top-level members (donkey settings)
 
-            # Crear conexiones (edges) desde linkedTo
-            if hasattr(self, "graph") and self.graph:
-                for s in c.get("starts", []):
-                    links = s.get("linkedTo", [])
-                    for link in links:
-                        origin_id = s["id"]
-                        dest_id = link["starId"]
-                        distance = float(link["distance"])
-                        # Solo agregamos si ambos nodos existen
-                        if self.graph.get_star(origin_id) and self.graph.get_star(dest_id):
-                            self.graph.add_edge(origin_id, dest_id, distance)
-
-            constellations.append(const)
-
-        from .donkey import Donkey
-        burro = Donkey(
-            health=data.get("estadoSalud", "good").lower(),
-            energy=data.get("burroenergiaInicial", 100),
-            grass_kg=data.get("pasto", 0)
-        )
+        reader = JsonStreamReader(fileobj)
+        for key, value in reader.items("constellations"):
+            if key != "constellations":
+                fields[key] = value
+            elif not isinstance(value, dict):
+                self._report_problem(report, "invalid_constellations", value)
+            else:
+                constellations.append(self._load_constellation(value, stars, pending, report))
 
-        self.burro = burro
+        # Links to stars defined later in the file; the rest are dangling
+        for const, origin_id, dest_id, distance in pending:
+            if dest_id in stars:
+                self._add_link(const, origin_id, dest_id, distance, report)
+            else:
+                self._report_problem(report, "dangling_links", (origin_id, dest_id))
 
-        # --- Verificación opcional ---
-        if hasattr(self, "graph") and self.graph:
-            print("=== Graph Loaded ===")
-            for node_id, node in self.graph.nodes.items():
-                print(f"Star {node_id}: connected to {list(node.connections.keys())}")
+        self.fields = fields
+        self._set_donkey()
 
-        print("=== Graph Loaded ===")
-        for node_id, node in self.graph.nodes.items():
-            print(f"Star {node_id} connected to: {list(node.connections.keys())}")
+        report["constellations"] = len(constellations)
+        report["stars"] = len(stars)
+        report["characters"] = reader.chars_read
+        report["elapsed"] = time.perf_counter() - started
+        self.load_report = report
+
+        if self.graph:
+            print(f"=== Graph Loaded: {len(self.graph.nodes)} stars, "
+                  f"{self.graph.collapsed_duplicates} duplicate connections collapsed ===")
+        problems = {k: v for k, v in report["problems"].items() if v}
+        if problems:
+            print(f"⚠️ Load problems: {problems} (examples: {report['examples']})")
         return constellations
 
+    def _set_donkey(self):
+        fields = self.fields
+        self.burro = Donkey(
+            health=str(fields.get("estadoSalud", "good")).lower(),
+            energy=fields.get("burroenergiaInicial", 100),
+            grass_kg=fields.get("pasto", 0)
+        )
+
+    def _load_constellation(self, data, stars, pending, report):
+        const = Constellation(data.get("name", ""), data.get("color", "#FFFFFF"))
+        if self.graph:
+            self.graph.constellations.append(const)
+
+        # Crear estrellas
+        links = []
+        for s in data.get("starts", []):
+            star = self._parse_star(s, report)
+            if star is None:
+                continue
+            if star.id in stars:
+                # Stars shared by several constellations are listed in each of them
+                first = stars[star.id]
+                if (first.name, first.x, first.y) != (star.name, star.x, star.y):
+                    self._report_problem(report, "conflicting_ids", star.id)
+                report["shared_stars"] += 1
+                star = first
+            else:
+                stars[star.id] = star
+                if self.graph:
+                    self.graph.add_star(star)
+            const.add_star(star)
+            links.append((star.id, s.get("linkedTo", [])))
+
+        # Crear conexiones (edges) desde linkedTo
+        for origin_id, star_links in links:
+            for link in star_links:
+                try:
+                    dest_id = link["starId"]
+                    distance = float(link["distance"])
+                except (KeyError, TypeError, ValueError):
+                    self._report_problem(report, "invalid_links", (origin_id, link))
+                    continue
+                if dest_id == origin_id or not distance >= 0:
+                    self._report_problem(report, "invalid_links", (origin_id, link))
+                elif dest_id in stars:
+                    self._add_link(const, origin_id, dest_id, distance, report)
+                else:
+                    pending.append((const, origin_id, dest_id, distance))
+        return const
+
+    def _parse_star(self, s, report):
+        """Builds a Star from its JSON record, or returns None if it is malformed."""
+        try:
+            return Star(
+                s["id"], s["label"], float(s["coordenates"]["x"]), float(s["coordenates"]["y"]),
+                galaxy=s.get("galaxy"),
+                is_hypergiant=s.get("hypergiant", False),
+                life_delta=s.get("lifeDelta", s.get("timeToEat", 0)),
+                investigation_time=s.get("timeToEat", 0),
+                energy_cost=s.get("amountOfEnergy", 0)
+            )
+        except (KeyError, TypeError, ValueError):
+            self._report_problem(report, "invalid_stars", s.get("id") if isinstance(s, dict) else s)
+            return None
+
+    def _add_link(self, const, origin_id, dest_id, distance, report):
+        const.add_edge(origin_id, dest_id, distance)
+        if self.graph:
+            self.graph.add_edge(origin_id, dest_id, distance)
+        report["links"] += 1
 
+    @staticmethod
+    def _new_report():
+        return {
+            "constellations": 0,
+            "stars": 0,
+            "links": 0,
+            "shared_stars": 0,       # Extra listings of a star in other constellations
+            "problems": {"invalid_constellations": 0, "invalid_stars": 0, "conflicting_ids": 0,
+                         "invalid_links": 0, "dangling_links": 0},
+            "examples": {},          # Up to MAX_EXAMPLES offending ids / links per problem
+            "characters": 0,
+            "elapsed": 0.0,
+        }
+
+    MAX_EXAMPLES = 5
 
+    def _report_problem(self, report, problem, example):
+        report["problems"][problem] += 1
+        examples = report["examples"].setdefault(problem, [])
+        if len(examples) < self.MAX_EXAMPLES:
+            examples.append(example)
 
     def save_json(self, graph):
         """
-        Saves the current graph state back to the same JSON file.
+        Saves the current graph state back to the same JSON file. The graph is
+        copied here, on the thread that mutates it; the write is deferred and
+        coalesced with later saves (call flush() to force it). A graph that has
+        not changed since the last save is not copied or written again.
         """
         if not self.file_path:
             print("No JSON file loaded yet.")
             return
 
-        data = {
-            "constellations": [c.to_dict() for c in graph.constellations]
-        }
+        self._dirty_graph = graph
+        if self._saved_version == (graph, graph.version):
+            return
+        records = len(self.journal) if self.journal is not None else 0
+        self._pending = (self._capture(graph), records)
+        self._saved_version = (graph, graph.version)
+        if self.write_delay is None:
+            self._write_file()
+            return
+        if self.persister is None:
+            self.persister = WriteBehindPersister(self._write_file, self.write_delay, name="json-writer")
+        self.persister.mark_dirty()
+
+    def flush(self):
+        """Writes any pending save now. Returns True if the file was rewritten."""
+        return self.persister.flush() if self.persister else False
 
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+    def persist_stats(self):
+        """Save requests, actual file writes and writes saved by coalescing."""
+        if self.persister is None:
+            return {"requests": 0, "writes": 0, "saved_writes": 0, "pending": False, "errors": 0}
+        return self.persister.stats()
+
+    def _write_file(self):
+        """
+        Writes the latest copy taken by save_json() atomically (temp file in the
+        same folder, then rename) in the format load_path() reads, and empties
+        the edit journal if the copy includes every record in it. Records
+        journaled after the copy are kept; replaying them is harmless.
+        """
+        pending = self._pending
+        if pending is None or not self.file_path:
+            return
+        capture, records = pending
+        journal = self.journal
+        if journal is not None:
+            journal.lock.acquire()   # No edit may be journaled between the dump and the reset
+        try:
+            data = self._compose(capture)
+            tmp_path = f"{self.file_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, self.file_path)
+            if journal is not None and len(journal) == records:
+                journal.reset()
+        finally:
+            if journal is not None:
+                journal.lock.release()
         print(f"✅ JSON updated: {self.file_path}")
 
+    # Star attribute -> key of the star record in the file
+    STAR_KEYS = (("name", "label"), ("is_hypergiant", "hypergiant"), ("investigation_time", "timeToEat"),
+                 ("life_delta", "lifeDelta"), ("energy_cost", "amountOfEnergy"), ("galaxy", "galaxy"))
+
+    def _capture(self, graph):
+        """
+        Plain copy of what a save writes: star attributes, connections and
+        constellation membership. Taken on the thread that mutates the graph.
+        """
+        stars = {sid: (star.name, star.x, star.y, star.is_hypergiant, star.investigation_time,
+                       star.life_delta, star.energy_cost, star.galaxy)
+                 for sid, star in graph.nodes.items()}
+        adjacency = {sid: dict(graph.get_neighbors(sid)) for sid in graph.nodes}
+        constellations = [(c.name, c.color, [star.id for star in c.stars]) for c in graph.constellations]
+        return {"stars": stars, "adjacency": adjacency, "constellations": constellations}
+
+    def _compose(self, capture):
+        """
+        The file contents for a capture. The current file is used as the base so
+        nothing the loader ignores is lost (extra keys, absent keys, dangling or
+        invalid links, skipped records); only values that differ from the graph
+        are overwritten, and connections the graph gained or lost are added or
+        removed. Without a readable base the graph is written from scratch.
+        """
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                base = json.load(f)
+        except (OSError, ValueError):
+            base = None
+        if not isinstance(base, dict) or not isinstance(base.get("constellations"), list):
+            return self._fresh_dict(capture)
+
+        stars, adjacency = capture["stars"], capture["adjacency"]
+        report = self._new_report()              # Problems were reported at load time
+        records = []                             # (star_id, record, parsed Star) of every valid star record
+        first = {}                               # {star_id: Star} as loaded (the first record wins)
+        for const in base["constellations"]:
+            if not isinstance(const, dict) or not isinstance(const.get("starts"), list):
+                continue
+            for record in const["starts"]:
+                star = self._parse_star(record, report) if isinstance(record, dict) else None
+                if star is not None and star.id in stars:
+                    first.setdefault(star.id, star)
+                    records.append((star.id, record, star))
+        # Attributes changed since loading are written to every record of the star
+        changes = {sid: self._star_changes(star, stars[sid]) for sid, star in first.items()}
+        for sid, record, parsed in records:
+            if changes[sid]:
+                self._overlay_star(record, parsed, changes[sid], report)
+        records = [(sid, record) for sid, record, _ in records]
+
+        # Links: keep the file's entries for unchanged connections, fix changed
+        # distances, drop removed connections and add new ones
+        linked = {}                              # {pair: shortest distance listed in the file}
+        for origin_id, record in records:
+            for link in self._valid_links(origin_id, record, stars):
+                pair = frozenset((origin_id, link["starId"]))
+                linked[pair] = min(linked.get(pair, math.inf), float(link["distance"]))
+        first_record = {}
+        for origin_id, record in records:
+            first_record.setdefault(origin_id, record)
+            valid = {id(link) for link in self._valid_links(origin_id, record, stars)}
+            if not valid:
+                continue
+            kept = []
+            for link in record["linkedTo"]:
+                if id(link) in valid:
+                    distance = adjacency[origin_id].get(link["starId"])
+                    if distance is None:
+                        continue                 # Connection removed or blocked
+                    if linked[frozenset((origin_id, link["starId"]))] != distance:
+                        link["distance"] = distance
+                kept.append(link)
+            record["linkedTo"] = kept
+        for origin_id, neighbors in adjacency.items():
+            for dest_id, distance in neighbors.items():
+                pair = frozenset((origin_id, dest_id))
+                if pair not in linked and origin_id in first_record:
+                    linked[pair] = distance
+                    first_record[origin_id].setdefault("linkedTo", []).append(
+                        {"starId": dest_id, "distance": distance})
+        return base
+
+    def _star_changes(self, loaded, values):
+        """{attribute: value} of the graph star that differ from the loaded record."""
+        current = dict(zip(("name", "x", "y", "is_hypergiant", "investigation_time",
+                            "life_delta", "energy_cost", "galaxy"), values))
+        return {attr: value for attr, value in current.items() if getattr(loaded, attr) != value}
+
+    def _overlay_star(self, record, parsed, changes, report):
+        """Writes the changed attributes into one star record, keeping everything else."""
+        if "x" in changes or "y" in changes:
+            record["coordenates"].update(x=changes.get("x", parsed.x), y=changes.get("y", parsed.y))
+        for attr, key in self.STAR_KEYS:
+            if attr in changes:
+                record[key] = changes[attr]
+        # lifeDelta defaults to timeToEat: pin it if changing timeToEat moved it
+        life_delta = changes.get("life_delta", parsed.life_delta)
+        if self._parse_star(record, report).life_delta != life_delta:
+            record["lifeDelta"] = life_delta
+
+    @staticmethod
+    def _valid_links(origin_id, record, stars):
+        """The linkedTo entries the loader turned into connections."""
+        links = record.get("linkedTo")
+        if not isinstance(links, list):
+            return []
+        valid = []
+        for link in links:
+            try:
+                dest_id = link["starId"]
+                distance = float(link["distance"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if dest_id != origin_id and distance >= 0 and dest_id in stars:
+                valid.append(link)
+        return valid
+
+    def _fresh_dict(self, capture):
+        """The capture in the constellation file format (starts / linkedTo)."""
+        stars, adjacency = capture["stars"], capture["adjacency"]
+        written = set()              # Shared stars carry their links only once
+        constellations = []
+        for name, color, star_ids in capture["constellations"]:
+            starts = []
+            for sid in star_ids:
+                label, x, y, hypergiant, time_to_eat, life_delta, energy, galaxy = stars[sid]
+                record = {
+                    "id": sid,
+                    "label": label,
+                    "coordenates": {"x": x, "y": y},
+                    "hypergiant": hypergiant,
+                    "timeToEat": time_to_eat,
+                    "lifeDelta": life_delta,
+                    "amountOfEnergy": energy,
+                    "linkedTo": [],
+                }
+                if galaxy is not None:
+                    record["galaxy"] = galaxy
+                if sid not in written:
+                    written.add(sid)
+                    record["linkedTo"] = [{"starId": dest, "distance": distance}
+                                          for dest, distance in adjacency[sid].items()]
+                starts.append(record)
+            constellations.append({"name": name, "color": color, "starts": starts})
+        return dict(self.fields, constellations=constellations)
+
+    def prepare_contraction_hierarchy(self, graph):
+        """
+        Prepares the graph's contraction hierarchy, persisted next to the loaded JSON
+        as <file>.ch.npz and rebuilt only when the graph content hash changes.
+        """
+        cache_path = f"{self.file_path}.ch.npz" if self.file_path else None
+        return graph.prepare_contraction_hierarchy(cache_path)
+
     # -------------------------------------------------
     #  Runtime update methods
     # -------------------------------------------------
     def update_star(self, graph, star_id, new_data):
         """
-        Updates a star in the graph and automatically writes changes to the JSON.
+        Updates a star in the graph and records the change in the journal.
         new_data is a dict like {"energy_cost": 5, "life_delta": 2}.
         """
-        star = graph.get_star(star_id)
+        star = graph.update_star(star_id, **new_data)
         if star:
-            star.update_data(**new_data)
-            self.save_json(graph)
+            self._record(graph, "update_star", star=star_id, fields=new_data)
 
     def update_connection(self, graph, origin_id, dest_id, new_distance):
         """
@@ -126,7 +521,31 @@ class JsonManager:
         graph.remove_edge(origin_id, dest_id)
         # Add new one
         graph.add_edge(origin_id, dest_id, new_distance)
-        self.save_json(graph)
+        self._record(graph, "set_edge", origin=origin_id, dest=dest_id, distance=new_distance)
+
+    def block_path(self, graph, origin_id, dest_id):
+        """Blocks a connection and records it in the journal."""
+        graph.block_path(origin_id, dest_id)
+        self._record(graph, "block", origin=origin_id, dest=dest_id)
+
+    def unblock_path(self, graph, origin_id, dest_id, distance):
+        """Restores a connection and records it in the journal."""
+        graph.unblock_path(origin_id, dest_id, distance)
+        self._record(graph, "unblock", origin=origin_id, dest=dest_id, distance=distance)
+
+    def compact(self, graph=None):
+        """Rewrites the base file with every edit now, emptying the journal."""
+        self.save_json(graph or self._dirty_graph or self.graph)
+        return self.flush()
+
+    def _record(self, graph, op, **data):
+        """Journals one edit; compaction is scheduled once the journal is full."""
+        if self.journal_limit is None or self.journal is None:
+            self.save_json(graph)
+            return
+        self.journal.record(op, **data)
+        if len(self.journal) >= self.journal_limit:
+            self.save_json(graph)
 
     def update_donkey(self, donkey, new_data):
         """
@@ -0,0 +1,119 @@
+import codecs
+import json
+
+
+class JsonStreamReader:
+    """
+    Incremental reader for a JSON document whose top level is an object holding
+    one large array (e.g. {"constellations": [...], "pasto": 3}). items() yields
+    the top-level members one by one, and the elements of the large array one
+    at a time, so only a single element is ever decoded in memory.
+
+    Works on text or binary (UTF-8) file objects using only the standard json
+    decoder: values are decoded with raw_decode() from a buffer that is refilled
+    (doubling the read size) whenever a value is cut off at its end.
+    """
+
+    def __init__(self, fileobj, chunk_size=1 << 20):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.chars_read = 0
+        self._utf8 = None            # Incremental decoder, set for binary streams
+
+    def items(self, array_key):
+        """
+        Yields (key, value) for every top-level member; the array under array_key
+        is yielded element by element as (array_key, element).
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self._decode()
+            if not isinstance(key, str):
+                self._error("Expected a member name")
+            self._expect(":")
+            if key == array_key and self._peek() == "[":
+                self.pos += 1
+                if self._peek() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        yield key, self._decode()
+                        if self._separator("]"):
+                            break
+            else:
+                yield key, self._decode()
+            if self._separator("}"):
+                return
+
+    # -------------------------------------------------
+    #  Buffer handling
+    # -------------------------------------------------
+    def _fill(self, size):
+        """Reads at least size more characters (unless the stream ends)."""
+        if self.pos > len(self.buf) // 2:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        data = self.fileobj.read(size)
+        if isinstance(data, bytes):
+            if self._utf8 is None:
+                self._utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+            data = self._utf8.decode(data, final=not data)
+        elif self.chars_read == 0 and data.startswith("\ufeff"):
+            data = data[1:]
+        if not data:
+            self.eof = True
+        self.chars_read += len(data)
+        self.buf += data
+
+    def _peek(self):
+        """Skips whitespace and returns the next character ('' at the end)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos] if self.pos < len(self.buf) else ""
+            self._fill(self.chunk_size)
+
+    def _expect(self, char):
+        if self._peek() != char:
+            self._error(f"Expected '{char}'")
+        self.pos += 1
+
+    def _separator(self, closing):
+        """Consumes ',' (returns False) or the closing bracket (returns True)."""
+        char = self._peek()
+        self.pos += 1
+        if char == ",":
+            return False
+        if char == closing:
+            return True
+        self.pos -= 1
+        self._error(f"Expected ',' or '{closing}'")
+
+    def _decode(self):
+        self._peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number or literal touching the end of the buffer may continue
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as error:
+                if self.eof:
+                    self._error(error.msg, error.pos)
+            self._fill(size)
+            size = max(size, len(self.buf) - self.pos)
+
+    def _error(self, message, pos=None):
+        pos = self.pos if pos is None else pos
+        offset = self.chars_read - (len(self.buf) - pos)
+        raise ValueError(f"{message} at character {offset}")
@@ -0,0 +1,185 @@
+"""
+Headless Monte-Carlo mission runner.
+
+Runs many Simulator missions with different donkey parameters across a process
+pool and aggregates the outcomes. The graph is sent to each worker once, when
+the worker starts, and every mission in that worker reuses it (and its
+distance caches).
+
+Run from the project root:
+    python -m classes.monte_carlo galaxy.json --missions 2000 --workers 4
+"""
+import argparse
+import contextlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .donkey import Donkey
+from .graph import Graph
+from .json_manager import JsonManager
+from .simulator import Simulator
+
+# Graph of the current worker process, set once by _init_worker
+_worker_graph = None
+_worker_options = {}
+
+
+def _init_worker(graph, options):
+    global _worker_graph, _worker_options
+    _worker_graph = graph
+    _worker_options = options
+
+
+def _run_mission(mission):
+    """Runs one mission on the worker's graph and returns its outcome."""
+    graph = _worker_graph
+    donkey = Donkey(
+        health=mission.get("health", "excellent"),
+        age=mission.get("age", 5),
+        energy=mission.get("energy", 100),
+        grass_kg=mission.get("grass_kg", 10),
+        life_left=mission.get("life_left", 100),
+    )
+    simulator = Simulator(graph, donkey, JsonManager())
+    simulator.event_log.enabled = _worker_options.get("log", False)
+    simulator.planner.time_limit = _worker_options.get("planner_time_limit", 0.5)
+    simulator.beam_planner.time_limit = simulator.planner.time_limit
+
+    # Missions log every step; keep worker output quiet
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        report = simulator.start_simulation(mission["start_id"], mode=mission.get("mode", "max_stars"))
+
+    return {
+        "mission": mission,
+        "alive": donkey.is_alive(),
+        "stars_visited": report["total_visited"],
+        "energy": donkey.energy,
+        "grass_kg": donkey.grass_kg,
+        "life_left": donkey.life_left,
+        "health": donkey.health,
+    }
+
+
+def random_missions(graph, count, seed=0, energy=(20, 100), grass_kg=(0, 20),
+                    life_left=(50, 150), healths=None, mode="max_stars"):
+    """
+    Draws count mission parameter sets: random start star, health and uniform
+    energy / grass / life within the given ranges. Deterministic for a seed.
+    """
+    rng = random.Random(seed)
+    stars = list(graph.nodes)
+    healths = healths or Donkey.HEALTH_LEVELS[:-1]
+    return [
+        {
+            "start_id": rng.choice(stars),
+            "health": rng.choice(healths),
+            "energy": round(rng.uniform(*energy), 1),
+            "grass_kg": round(rng.uniform(*grass_kg), 1),
+            "life_left": round(rng.uniform(*life_left), 1),
+            "mode": mode,
+        }
+        for _ in range(count)
+    ]
+
+
+class MonteCarloRunner:
+    """
+    Fans missions out over a process pool and summarizes the results.
+    workers=1 runs everything in the current process (no pool).
+    """
+
+    def __init__(self, graph, workers=None, chunksize=None, planner_time_limit=0.5):
+        self.graph = graph
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.options = {"planner_time_limit": planner_time_limit}
+        self.results = []
+
+    def run(self, missions):
+        """Runs every mission and returns the summary report."""
+        missions = list(missions)
+        if self.workers == 1:
+            _init_worker(self.graph, self.options)
+            self.results = [_run_mission(m) for m in missions]
+        else:
+            chunksize = self.chunksize or max(1, len(missions) // (self.workers * 8))
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.graph, self.options)) as pool:
+                self.results = list(pool.map(_run_mission, missions, chunksize=chunksize))
+        return self.summary()
+
+    def summary(self):
+        """Survival rate and distributions of stars visited and final resources."""
+        results = self.results
+        if not results:
+            return {"missions": 0}
+        alive = np.array([r["alive"] for r in results])
+        visited = np.array([r["stars_visited"] for r in results], dtype=float)
+        energy = np.array([r["energy"] for r in results], dtype=float)
+
+        by_health = {}
+        for health in Donkey.HEALTH_LEVELS:
+            mask = np.array([r["mission"].get("health") == health for r in results])
+            if mask.any():
+                by_health[health] = {
+                    "missions": int(mask.sum()),
+                    "survival_rate": float(alive[mask].mean()),
+                    "mean_stars_visited": float(visited[mask].mean()),
+                }
+
+        counts, edges = np.histogram(energy, bins=10, range=(0, 100))
+        return {
+            "missions": len(results),
+            "survival_rate": float(alive.mean()),
+            "stars_visited": self._distribution(visited),
+            "final_energy": self._distribution(energy),
+            "final_energy_histogram": {
+                f"{int(lo)}-{int(hi)}": int(c) for lo, hi, c in zip(edges, edges[1:], counts)
+            },
+            "final_life_left": self._distribution(np.array([r["life_left"] for r in results], dtype=float)),
+            "by_health": by_health,
+        }
+
+    @staticmethod
+    def _distribution(values):
+        p10, p50, p90 = np.percentile(values, [10, 50, 90])
+        return {
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "min": float(values.min()),
+            "p10": float(p10),
+            "median": float(p50),
+            "p90": float(p90),
+            "max": float(values.max()),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many donkey missions in parallel.")
+    parser.add_argument("json", help="constellation JSON file")
+    parser.add_argument("--missions", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", default="max_stars", choices=["max_stars", "beam"])
+    args = parser.parse_args()
+
+    graph = Graph()
+    JsonManager(graph).load_file(args.json)
+    runner = MonteCarloRunner(graph, workers=args.workers)
+    summary = runner.run(random_missions(graph, args.missions, seed=args.seed, mode=args.mode))
+
+    print(f"Missions: {summary['missions']}   survival rate: {summary['survival_rate']:.1%}")
+    for key in ("stars_visited", "final_energy", "final_life_left"):
+        d = summary[key]
+        print(f"{key:<16} mean {d['mean']:8.2f}  p10 {d['p10']:8.2f}  "
+              f"median {d['median']:8.2f}  p90 {d['p90']:8.2f}")
+    for health, row in summary["by_health"].items():
+        print(f"  {health:<10} {row['missions']:>6} missions  survival {row['survival_rate']:.1%}  "
+              f"stars {row['mean_stars_visited']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
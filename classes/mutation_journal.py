@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+
+
+def _update_star(graph, r):
+    graph.update_star(r["star"], **r["fields"])
+
+
+def _set_edge(graph, r):
+    graph.remove_edge(r["origin"], r["dest"])
+    graph.add_edge(r["origin"], r["dest"], float(r["distance"]))
+
+
+def _remove_edge(graph, r):
+    graph.remove_edge(r["origin"], r["dest"])
+
+
+def _block(graph, r):
+    graph.block_path(r["origin"], r["dest"])
+
+
+def _unblock(graph, r):
+    graph.unblock_path(r["origin"], r["dest"], float(r["distance"]))
+
+
+# Journal operations and the fields of their records
+OPERATIONS = {
+    "update_star": _update_star,   # star, fields
+    "set_edge": _set_edge,         # origin, dest, distance (add or reweight)
+    "remove_edge": _remove_edge,   # origin, dest
+    "block": _block,               # origin, dest
+    "unblock": _unblock,           # origin, dest, distance
+}
+
+
+class MutationJournal:
+    """
+    Append-only log of galaxy edits, one compact JSON line per mutation, kept
+    next to the base JSON (<file>.journal). Recording an edit costs one short
+    append whatever the size of the galaxy; replay() re-applies the records
+    over a freshly loaded base, and reset() empties the log once the base file
+    has been rewritten with the edits (compaction).
+
+    Records are idempotent (they set values rather than add to them), so a
+    record replayed over a base that already contains it is harmless. A torn
+    last line left by a crash is ignored.
+    """
+
+    def __init__(self, path, fsync=False):
+        self.path = path
+        self.fsync = fsync           # os.fsync after every record (slower, crash-proof)
+        self.records = 0             # Records currently in the file
+        self.lock = threading.RLock()  # Held by compaction so no record slips in between
+        self._file = None
+
+    # -------------------------------------------------
+    #  Writing
+    # -------------------------------------------------
+    def record(self, op, **data):
+        """Appends one mutation, e.g. record("block", origin=1, dest=2)."""
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown journal operation: {op}")
+        line = json.dumps({"op": op, **data}, separators=(",", ":"), ensure_ascii=False)
+        with self.lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+                if self._file.tell() and not self._ends_with_newline():
+                    self._file.write("\n")      # Close a line torn by a crash
+            self._file.write(line + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.records += 1
+
+    def reset(self):
+        """Empties the journal (call only after the base file holds every edit)."""
+        with self.lock:
+            self.close()
+            if os.path.exists(self.path):
+                open(self.path, "w", encoding="utf-8").close()
+            self.records = 0
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # -------------------------------------------------
+    #  Replay
+    # -------------------------------------------------
+    def replay(self, graph):
+        """
+        Applies every record of the journal file to graph.
+        Returns {"applied": n, "skipped": m}; unreadable lines are skipped.
+        """
+        applied = skipped = 0
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        self.apply(graph, json.loads(line))
+                        applied += 1
+                    except (ValueError, KeyError, TypeError):
+                        skipped += 1
+        self.records = applied + skipped
+        return {"applied": applied, "skipped": skipped}
+
+    @staticmethod
+    def apply(graph, record):
+        """Applies one record to graph."""
+        OPERATIONS[record["op"]](graph, record)
+
+    def __len__(self):
+        return self.records
+
+    def __repr__(self):
+        return f"MutationJournal({self.path}, records={self.records})"
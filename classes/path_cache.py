@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+
+class ShortestPathCache:
+    """
+    LRU cache of single-source results keyed by (source_id, algorithm, topology_version).
+    Because that version changes whenever a star is added or a connection changes,
+    stale trees can never be returned; they simply age out of the cache.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()    # {(source, algorithm, topology_version): (dist, pred)}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the cached (dist, pred) for key, or None."""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Stores a result, evicting the least recently used one if full."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        """Changes the capacity, evicting entries if needed."""
+        self.maxsize = maxsize
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        """Returns hit/miss counters and current occupancy."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def __repr__(self):
+        return f"ShortestPathCache(size={len(self.entries)}, maxsize={self.maxsize})"
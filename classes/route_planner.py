@@ -0,0 +1,362 @@
+import math
+import time
+from collections import namedtuple
+from .donkey import Donkey
+
+HEALTH_LEVELS = Donkey.HEALTH_LEVELS
+DEAD = HEALTH_LEVELS.index("dead")
+
+# Donkey resources during planning; health is an index into Donkey.HEALTH_LEVELS
+MissionState = namedtuple("MissionState", ["energy", "grass", "life", "health"])
+
+
+def state_from_donkey(donkey):
+    """Builds the planning state of a Donkey."""
+    return MissionState(float(donkey.energy), float(donkey.grass_kg), float(donkey.life_left),
+                        HEALTH_LEVELS.index(donkey.health))
+
+
+def _consume_energy(energy, health, amount):
+    """Donkey.consume_energy: hitting 0 energy degrades health one level."""
+    energy -= amount
+    if energy <= 0:
+        energy = 0
+        health += 1          # excellent -> good -> ... -> dying -> dead
+    return energy, health
+
+
+def advance(state, distance, star):
+    """
+    Applies one hop of a mission exactly like Donkey.move_to followed by
+    Simulator.handle_star_interaction (eat below 50% energy, research, hypergiant
+    recharge). Returns the new MissionState, or None if the donkey dies.
+    """
+    energy, grass, life, health = state
+
+    # Travel
+    energy, health = _consume_energy(energy, health, distance * 2)
+    life -= distance
+    if health >= DEAD or life <= 0:
+        return None
+
+    # Eat if energy < 50%
+    if energy < 50 and grass > 0:
+        kg = min(1, grass)
+        grass -= kg
+        energy = min(100, energy + Donkey.RECOVERY_RATES[HEALTH_LEVELS[health]] * kg)
+
+    # Research
+    energy, health = _consume_energy(energy, health, star.energy_cost)
+    life -= star.investigation_time
+    if health >= DEAD or life <= 0:
+        return None
+    life += star.life_delta
+    if life <= 0:
+        return None
+
+    # Hypergiant recharge
+    if star.is_hypergiant:
+        energy = min(100, energy * 1.5)
+        grass *= 2
+
+    return MissionState(energy, grass, life, health)
+
+
+def dominates(a, b):
+    """
+    True if state a does at least as well as b on every possible continuation.
+    More energy or grass, or better health, is not always better: eating only
+    happens below 50% energy, so a donkey that is slightly behind may eat on a
+    later leg where the other does not, and overtake it. Extra life is always
+    safe; the other resources must match unless b has no grass left (b never
+    eats again, so a's lead in energy and health can only grow).
+    """
+    if a.life < b.life:
+        return False
+    if b.grass <= 0:
+        return a.energy >= b.energy and a.health <= b.health
+    return a.energy == b.energy and a.grass == b.grass and a.health == b.health
+
+
+class RoutePlanner:
+    """
+    Plans a route that visits as many stars as possible before the donkey runs out
+    of energy, health or life, using the same resource rules as the simulation.
+    Stars are visited in order and travel between them follows shortest paths.
+
+    Small sets of reachable stars are solved with an exact bitmask DP that keeps the
+    non-dominated resource states of every (visited set, last star); larger ones use
+    depth-first branch-and-bound with memoized reachability upper bounds. Both stop
+    at time_limit seconds and return the best route found so far. Energy prunes
+    few DP states (see dominates()), so the DP is kept to exact_limit stars.
+
+    In galaxies with more than max_candidates reachable stars only the nearest
+    ones are considered, so the distance matrix stays small.
+    """
+
+    def __init__(self, graph, exact_limit=8, time_limit=2.0, max_candidates=200):
+        self.graph = graph
+        self.exact_limit = exact_limit
+        self.time_limit = time_limit
+        self.max_candidates = max_candidates
+        self.last_stats = {}
+        self.last_index = {}         # {star_id: row} of the last distance matrix
+        self.last_matrix = []        # Distance matrix (lists) of the last plan
+        self.last_topology = None    # Graph.topology_version the matrix was computed at
+        self.should_stop = None      # Optional callable; True makes plan() return early
+
+    # -----------------------------
+    #  Public API
+    # -----------------------------
+    def plan(self, start_id, donkey):
+        """Returns the list of star IDs to visit, starting at start_id."""
+        started = time.perf_counter()
+        self._deadline = started + self.time_limit
+        ids, dist = self._candidates(start_id)
+        state = state_from_donkey(donkey)
+
+        if len(ids) - 1 <= self.exact_limit:
+            method = "bitmask_dp"
+            route, complete = self._plan_dp(ids, dist, state)
+        else:
+            method = "branch_and_bound"
+            route, complete = self._plan_branch_and_bound(ids, dist, state)
+
+        self.last_stats = {
+            "method": method,
+            "candidates": len(ids) - 1,
+            "stars": len(route),
+            "optimal": complete,
+            "elapsed": time.perf_counter() - started,
+        }
+        return [ids[i] for i in route]
+
+    def is_feasible(self, route, donkey):
+        """True if the donkey survives every hop of route (a list of star IDs)."""
+        state = state_from_donkey(donkey)
+        for origin, dest in zip(route, route[1:]):
+            distance = self.distance(origin, dest)
+            if distance == math.inf:
+                return False
+            state = advance(state, distance, self.graph.get_star(dest))
+            if state is None:
+                return False
+        return True
+
+    def candidates(self, start_id):
+        """
+        Start star plus the reachable stars plan() would consider (at most
+        max_candidates, the nearest ones). Their distance matrix is kept for
+        distance() and route_matrix().
+        """
+        ids, _ = self._candidates(start_id)
+        return ids
+
+    def distance(self, origin_id, dest_id):
+        """
+        Shortest distance between two stars, from the last plan's matrix while no
+        connection has changed since.
+        """
+        i = self.last_index.get(origin_id)
+        j = self.last_index.get(dest_id)
+        if i is not None and j is not None and self.last_topology == self.graph.topology_version:
+            return self.last_matrix[i][j]
+        return self.graph.shortest_distance(origin_id, dest_id)
+
+    def route_matrix(self, route):
+        """Distance matrix between the stars of route, in route order."""
+        if (self.last_topology == self.graph.topology_version
+                and all(sid in self.last_index for sid in route)):
+            rows = [self.last_index[sid] for sid in route]
+            return [[self.last_matrix[i][j] for j in rows] for i in rows]
+        return self.graph.distance_matrix(route)
+
+    def route_distance(self, route):
+        """Total travel distance of a route of star IDs."""
+        return sum(self.distance(a, b) for a, b in zip(route, route[1:]))
+
+    # -----------------------------
+    #  Shared helpers
+    # -----------------------------
+    def _candidates(self, start_id):
+        """
+        Start star plus the reachable stars to plan over, with their distance
+        matrix as lists.
+        """
+        component = self.graph.reachable_stars(start_id)
+        if len(component) - 1 <= self.max_candidates:
+            ids = [start_id] + [sid for sid in self.graph.nodes
+                                if sid in component and sid != start_id]
+            matrix = self.graph.distance_matrix(ids).tolist()
+        else:
+            # Nearest stars only. Any two of them are at most 2 * radius apart
+            # (through the start), so searches bounded by that are exact.
+            near = self.graph.bounded_distances(start_id, max_settled=self.max_candidates + 1)
+            ids = [sid for sid in near if sid in self.graph.nodes]
+            cutoff = 2 * max(near.values())
+            matrix = []
+            for sid in ids:
+                row = self.graph.bounded_distances(sid, cutoff=cutoff)
+                matrix.append([row.get(other, math.inf) for other in ids])
+
+        self.last_index = {sid: i for i, sid in enumerate(ids)}
+        self.last_matrix = matrix
+        self.last_topology = self.graph.topology_version
+        return ids, matrix
+
+    def _timed_out(self):
+        if self.should_stop is not None and self.should_stop():
+            return True
+        return time.perf_counter() > self._deadline
+
+    @staticmethod
+    def _greedy(dist, stars, state):
+        """
+        Nearest feasible star first, until none is left. Returns (route, travelled);
+        used as the starting incumbent so a timeout never yields less than this.
+        """
+        route, travelled, visited = [0], 0.0, {0}
+        while True:
+            row = dist[route[-1]]
+            step = None
+            for j in sorted(range(1, len(stars)), key=row.__getitem__):
+                if j in visited or row[j] == math.inf:
+                    continue
+                new_state = advance(state, row[j], stars[j])
+                if new_state is not None:
+                    step = (j, new_state)
+                    break
+            if step is None:
+                return route, travelled
+            travelled += row[step[0]]
+            route.append(step[0])
+            visited.add(step[0])
+            state = step[1]
+
+    # -----------------------------
+    #  Exact bitmask DP
+    # -----------------------------
+    def _plan_dp(self, ids, dist, start_state):
+        """
+        Layer k holds every (visited mask, last star) reachable with k visits, each
+        with its Pareto front of (state, travelled, parent) entries.
+        """
+        stars = [self.graph.get_star(sid) for sid in ids]
+        n = len(ids)
+        root = (start_state, 0.0, None, 0)             # (state, travelled, parent, last)
+        layer = {(1, 0): [root]}
+        best = root
+
+        while layer:
+            if self._timed_out():
+                greedy, _ = self._greedy(dist, stars, start_state)
+                partial = self._unwind(best)
+                return (greedy if len(greedy) > len(partial) else partial), False
+            next_layer = {}
+            for (mask, last), entries in layer.items():
+                for entry in entries:
+                    state, travelled = entry[0], entry[1]
+                    for j in range(1, n):
+                        if mask >> j & 1 or dist[last][j] == math.inf:
+                            continue
+                        new_state = advance(state, dist[last][j], stars[j])
+                        if new_state is None:
+                            continue
+                        candidate = (new_state, travelled + dist[last][j], entry, j)
+                        self._insert_front(next_layer.setdefault((mask | 1 << j, j), []), candidate)
+            if next_layer:
+                best = min((e for entries in next_layer.values() for e in entries),
+                           key=lambda e: e[1])
+            layer = next_layer
+
+        return self._unwind(best), True
+
+    @staticmethod
+    def _insert_front(front, candidate):
+        """Adds candidate to a Pareto front unless an existing entry dominates it."""
+        state, travelled = candidate[0], candidate[1]
+        for other in front:
+            if other[1] <= travelled and dominates(other[0], state):
+                return
+        front[:] = [o for o in front if not (travelled <= o[1] and dominates(state, o[0]))]
+        front.append(candidate)
+
+    @staticmethod
+    def _unwind(entry):
+        route = []
+        while entry is not None:
+            route.append(entry[3])
+            entry = entry[2]
+        route.reverse()
+        return route
+
+    # -----------------------------
+    #  Branch and bound
+    # -----------------------------
+    def _plan_branch_and_bound(self, ids, dist, start_state):
+        """
+        Depth-first search, nearest stars first, pruned with an upper bound: a star
+        can only still be visited if it lies within the distance the donkey can
+        travel with its remaining life plus any net life the unvisited stars give.
+        """
+        stars = [self.graph.get_star(sid) for sid in ids]
+        n = len(ids)
+        life_gain = [max(0.0, s.life_delta - s.investigation_time) for s in stars]
+        bound_memo = {}       # {(last, mask): (reach, bound)}
+
+        def upper_bound(last, mask, state):
+            reach = state.life + sum(life_gain[j] for j in range(1, n) if not mask >> j & 1)
+            cached = bound_memo.get((last, mask))
+            if cached is not None and reach <= cached[0]:
+                return cached[1]
+            row = dist[last]
+            bound = sum(1 for j in range(1, n) if not mask >> j & 1 and row[j] <= reach)
+            bound_memo[(last, mask)] = (reach, bound)
+            return bound
+
+        def children(last, mask, state):
+            order = sorted((j for j in range(1, n) if not mask >> j & 1 and dist[last][j] < math.inf),
+                           key=lambda j: dist[last][j])
+            result = []
+            for j in order:
+                new_state = advance(state, dist[last][j], stars[j])
+                if new_state is not None:
+                    result.append((j, new_state))
+            return result
+
+        route = [0]
+        best_route, best_travel = self._greedy(dist, stars, start_state)
+        travel = [0.0]
+        stack = [(1, iter(children(0, 1, start_state)))]
+        complete = True
+
+        while stack:
+            if self._timed_out():
+                complete = False
+                break
+            mask, pending = stack[-1]
+            step = next(pending, None)
+            if step is None:
+                stack.pop()
+                route.pop()
+                travel.pop()
+                continue
+
+            j, state = step
+            last = route[-1]
+            new_mask = mask | 1 << j
+            new_travel = travel[-1] + dist[last][j]
+            route.append(j)
+            travel.append(new_travel)
+
+            if len(route) > len(best_route) or (len(route) == len(best_route)
+                                                and new_travel < best_travel):
+                best_route, best_travel = list(route), new_travel
+
+            if len(route) + upper_bound(j, new_mask, state) <= len(best_route):
+                route.pop()
+                travel.pop()
+                continue
+            stack.append((new_mask, iter(children(j, new_mask, state))))
+
+        return best_route, complete
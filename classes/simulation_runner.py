@@ -0,0 +1,63 @@
+import queue
+import threading
+
+
+class SimulationRunner:
+    """
+    Runs Simulator.start_simulation on a worker thread so the UI stays responsive.
+    The simulator's progress events are put on a queue that the UI drains with
+    poll() (e.g. from a Tk `after` callback); no UI code runs on the worker.
+
+    Events are (kind, data) tuples:
+      ("planning", {"start_id"}), ("route", {"path", "stats"}),
+      ("move", {"star_id", "energy", "grass_kg", "life_left", "health"}),
+      ("done", {"report"}), ("cancelled", {"report"}), ("error", {"error"})
+    """
+
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.events = queue.Queue()
+        self.thread = None
+
+    def start(self, start_id, mode="max_stars"):
+        """Starts a mission in the background; returns False if one is already running."""
+        if self.is_running():
+            return False
+        self.simulator.listener = lambda kind, **data: self.events.put((kind, data))
+        self.thread = threading.Thread(target=self._work, args=(start_id, mode),
+                                       name="simulation", daemon=True)
+        self.thread.start()
+        return True
+
+    def cancel(self):
+        """Asks the running mission to stop at its next checkpoint."""
+        if self.is_running():
+            self.simulator.stop_simulation()
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def poll(self, max_events=200):
+        """Returns the events queued since the last call (at most max_events)."""
+        events = []
+        while len(events) < max_events:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def join(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def _work(self, start_id, mode):
+        try:
+            report = self.simulator.start_simulation(start_id, mode=mode)
+        except Exception as error:          # Reported to the UI instead of lost in the thread
+            self.events.put(("error", {"error": error}))
+            return
+        finally:
+            self.simulator.listener = None
+        kind = "cancelled" if self.simulator.cancelled else "done"
+        self.events.put((kind, {"report": report}))
@@ -1,7 +1,11 @@
-import time
 from .graph import Graph
 from .donkey import Donkey
+from .event_engine import EventEngine
+from .route_planner import RoutePlanner
+from .beam_planner import BeamSearchPlanner
+from .tour_optimizer import TourOptimizer
 from .json_manager import JsonManager
+from .event_log import EventLog
 
 class Simulator:
     """
@@ -13,59 +17,69 @@ class Simulator:
         self.graph = graph
         self.donkey = donkey
         self.json_manager = json_manager
+        self.planner = RoutePlanner(graph)
+        self.beam_planner = BeamSearchPlanner(graph)
+        self.tour_optimizer = TourOptimizer(graph)
+        self.route_planner = self.planner  # Planner whose distances cover current_path
 
         self.current_path = []       # List of star IDs in the current route
         self.visited_stars = []      # History of visited stars
         self.running = False
-        self.logs = []               # Stores messages for the report
+        self.event_log = EventLog()  # Bounded structured log (see EventLog)
+        self.engine = None           # EventEngine of the current follow_route()
+        self.mission_time = 0.0      # Virtual time of the last follow_route()
+        self.cancelled = False       # Set by stop_simulation(); checked between steps
+        self.meteor_blocks = {}      # {(origin, dest): distance} blocked during the current mission
+        self._save_deferred = False  # A save skipped while meteor blocks were active
+        self.listener = None         # Optional callback(kind, **data) for progress events
+
+        for planner in (self.planner, self.beam_planner):
+            planner.should_stop = lambda: self.cancelled
 
     # -------------------------------------------------
     #  Simulation control
     # -------------------------------------------------
     import math
 
-    def start_simulation(self, start_id, mode="max_stars"):
-        self.logs.append(f"Simulation started from {self.graph.get_star(start_id).name}.")
-
-        # ------------------------------------------------
-        # Ejecutamos el algoritmo desde la clase Graph
-        # ------------------------------------------------
-        try:
-            dist, pred = self.graph.bellman_ford(start_id)
-        except Exception:
-            dist, pred, _ = self.graph.dijkstra_simple(start_id, target_id=None)
+    def start_simulation(self, start_id, mode="max_stars", pacer=None, meteors=()):
+        """
+        Plans a mission from start_id and runs it on the discrete-event engine,
+        like follow_route() (pacer and meteors are passed on to it).
+        mode "max_stars" uses the exact / branch-and-bound planner, "beam" the
+        beam-search planner (configure self.beam_planner.width and .score).
+        """
+        self.cancelled = False       # A stop_simulation() of an earlier run does not carry over
+        self.log("Simulation started from %s.", self.graph.get_star(start_id).name,
+                 kind="start", star_id=start_id, echo=False)
 
         # ------------------------------------------------
-        # Obtenemos todos los nodos alcanzables
+        # Planificamos la ruta con los presupuestos del burro
         # ------------------------------------------------
-        reachable = [node for node, d in dist.items() if d != float("inf") and node != start_id]
-
-        if reachable:
-            path = [start_id] + sorted(reachable, key=lambda n: dist[n])
-        else:
-            path = [start_id]
+        if self.graph.is_split():
+            unreachable = len(self.graph.nodes) - len(self.graph.reachable_stars(start_id))
+            self.log("The galaxy is split: %d stars are unreachable from the start.", unreachable,
+                     level="warning", kind="split", star_id=start_id, echo=False)
+
+        self._emit("planning", start_id=start_id)
+        planner = self.beam_planner if mode == "beam" else self.planner
+        self.route_planner = planner
+        path = planner.plan(start_id, self.donkey)
+        stats = planner.last_stats
+        self.visited_stars = [start_id]
+        if self.cancelled:
+            self.log("Simulation cancelled during planning.", kind="cancel", echo=False)
+            return self.generate_report()
+        path, _ = self.shorten_route(path)
 
-        self.visited_stars = path
         self.current_path = path
-        self.logs.append(f"Route calculated (max stars): {path}")
+        self.log("Route calculated (max stars, %s): %s", stats["method"], path, kind="route", echo=False)
+        self._emit("route", path=path, stats=stats)
 
         # ------------------------------------------------
         # Simulamos el recorrido
         # ------------------------------------------------
-        for star_id in path:
-            star = self.graph.get_star(star_id)
-            if not star:
-                continue
-
-            self.donkey.energy -= 5
-            self.donkey.grass_kg -= 1
-            if self.donkey.energy <= 0 or self.donkey.grass_kg <= 0:
-                self.donkey.die()
-                self.logs.append("💀 Donkey died during the mission.")
-                break
-
-        self.donkey.current_star = self.graph.get_star(path[-1]) if path else self.graph.get_star(start_id)
-        self.logs.append("Simulation finished.")
+        self.donkey.current_star = self.graph.get_star(start_id)
+        report = self._run_route(pacer, meteors)
 
         # ------------------------------------------------
         # Mostramos la ruta en el mapa (si hay interfaz)
@@ -73,77 +87,183 @@ class Simulator:
         if hasattr(self, "canvas") and self.current_path:
             self.canvas.draw_route(self.current_path)
 
-        return self.generate_report()
-
-
+        return report
 
     def stop_simulation(self):
         """Stops the simulation."""
         self.running = False
-        self.log("Simulation stopped manually.")
+        self.cancelled = True
+        if self.engine is not None:
+            self.engine.stop()
+        self.log("Simulation stopped manually.", kind="cancel")
 
     # -------------------------------------------------
     #  Route calculations
     # -------------------------------------------------
     def calculate_route_max_stars(self):
         """
-        Calculates a route that tries to visit the maximum number of stars
-        before the donkey dies. (Simple heuristic for now)
+        Calculates a route that visits the maximum number of stars before the
+        donkey dies, respecting its energy, grass and life budgets.
         """
-        self.current_path = [self.donkey.current_star.id]
-
-        # Basic greedy approach: always go to the nearest unvisited star
-        current = self.donkey.current_star.id
-        while self.donkey.is_alive():
-            neighbors = self.graph.get_neighbors(current)
-            unvisited = [(v, d) for v, d in neighbors if v not in self.visited_stars]
-            if not unvisited:
-                break
-
-            next_star, dist = min(unvisited, key=lambda x: x[1])
-            self.current_path.append(next_star)
-            self.visited_stars.append(next_star)
-            current = next_star
-
-        self.log(f"Route calculated (max stars): {self.current_path}")
+        self.route_planner = self.planner
+        route = self.planner.plan(self.donkey.current_star.id, self.donkey)
+        stats = self.planner.last_stats
+        self.current_path, _ = self.shorten_route(route)
+        self.log("Route calculated (max stars): %s [%s, optimal=%s]", self.current_path,
+                 stats["method"], stats["optimal"], kind="route")
 
     def calculate_route_optimal(self):
         """
         Calculates the route that visits the most stars with the least cost
         using Dijkstra algorithm.
+        Only the planner's candidates (the nearest max_candidates stars) are
+        reordered, on the planner's bounded distance matrix; farther stars
+        follow in Dijkstra order.
         """
         start_id = self.donkey.current_star.id
-        dist, pred, path = self.graph.dijkstra(start_id)
-        self.current_path = list(path) if path else [start_id]
-        self.log(f"Optimal route calculated: {self.current_path}")
+        dist, pred = self.graph.cached_shortest_paths(start_id, algorithm="dijkstra")
+        reachable = [n for n, d in dist.items() if d != float("inf") and n != start_id]
+        route = [start_id] + sorted(reachable, key=lambda n: dist[n])
+        self.route_planner = self.planner
+        near = set(self.planner.candidates(start_id))
+        head = [n for n in route if n in near]
+        head, _ = self.tour_optimizer.improve(head, matrix=self.planner.route_matrix(head))
+        self.current_path = head + [n for n in route if n not in near]
+        self.log("Optimal route calculated: %s", self.current_path, kind="route")
+
+    def shorten_route(self, route):
+        """
+        Removes wasted travel (crossing legs, detours) from a route with 2-opt and
+        Or-opt moves, keeping only orders the donkey survives.
+        Returns (route, distance_saved).
+        """
+        route, saved = self.tour_optimizer.improve(
+            route, accept=lambda candidate: self.planner.is_feasible(candidate, self.donkey),
+            matrix=self.planner.route_matrix(route))
+        if saved > 0:
+            self.log("Route shortened by %.1f ly.", saved, level="debug", kind="route")
+        return route, saved
 
     # -------------------------------------------------
-    #  Route following
+    #  Route following (discrete events)
     # -------------------------------------------------
-    def follow_route(self):
-        """Simulates the donkey traveling along the calculated route."""
-        for star_id in self.current_path[1:]:
-            if not self.running or not self.donkey.is_alive():
-                break
-
-            star = self.graph.get_star(star_id)
-            prev_star = self.donkey.current_star
-            distance = self.get_distance(prev_star.id, star.id)
-
-            moved = self.donkey.move_to(star, distance)
-            self.log(f"Moved from {prev_star.name} to {star.name} (distance {distance})")
+    EAT_TIME = 0        # Virtual time spent eating (the donkey eats on arrival)
 
-            if not moved:
-                self.log("The donkey died during travel.")
-                break
+    def follow_route(self, pacer=None, meteors=()):
+        """
+        Simulates the donkey traveling along the calculated route with the
+        discrete-event engine: travel takes `distance` and research
+        `investigation_time` units of virtual time, and nothing waits on the
+        wall clock unless a pacer (e.g. RealTimePacer) is given.
+        meteors is an iterable of (time, origin_id, dest_id) path blocks.
+        """
+        self.cancelled = False
+        return self._run_route(pacer, meteors)
+
+    def _run_route(self, pacer, meteors):
+        """Runs self.current_path on a new EventEngine; returns the report."""
+        self.running = not self.cancelled   # stop_simulation() may come before the first event
+        self.visited_stars = self.current_path[:1]
+        self.engine = EventEngine(pacer)
+        for kind, handler in (("depart", self._on_depart), ("arrive", self._on_arrive),
+                              ("eat", self._on_eat), ("research", self._on_research),
+                              ("recharge", self._on_recharge), ("visit_done", self._on_visit_done),
+                              ("meteor", self._on_meteor)):
+            self.engine.on(kind, handler)
+
+        for at, origin_id, dest_id in meteors:
+            self.engine.schedule_at(at, "meteor", origin=origin_id, dest=dest_id)
+        self.engine.schedule(0, "depart", index=1)
+        try:
+            self.engine.run()
+        finally:
+            self._lift_meteor_blocks()
 
-            self.handle_star_interaction(star)
+        self.mission_time = self.engine.now
+        self.log("Simulation finished (mission time %.1f).", self.mission_time, kind="finish")
+        return self.generate_report()
 
-            # Optional delay for animations later
-            time.sleep(0.5)
+    def _on_depart(self, event):
+        index = event.data["index"]
+        if not self.running or not self.donkey.is_alive() or index >= len(self.current_path):
+            self._end_mission()
+            return
+        star = self.graph.get_star(self.current_path[index])
+        origin = self.donkey.current_star
+        distance = self.route_planner.distance(origin.id, star.id)
+        if distance == float("inf"):
+            self.log("%s is unreachable from %s, skipping it.", star.name, origin.name,
+                     level="warning", kind="skip", star_id=star.id)
+            self.engine.schedule(0, "depart", index=index + 1)
+            return
+        self.engine.schedule(distance, "arrive", index=index, origin=origin, distance=distance)
+
+    def _on_arrive(self, event):
+        star = self.graph.get_star(self.current_path[event.data["index"]])
+        origin = event.data["origin"]
+        moved = self.donkey.move_to(star, event.data["distance"])
+        self.log("Moved from %s to %s (distance %s)", origin.name, star.name, event.data["distance"],
+                 kind="move", star_id=star.id)
+        if not moved:
+            self.log("The donkey died during travel.", level="warning", kind="death", star_id=star.id)
+            self._end_mission()
+            return
+        self.visited_stars.append(star.id)
+        self._emit_move(star.id)
+        if self.donkey.energy < 50 and self.donkey.grass_kg > 0:
+            self.engine.schedule(0, "eat", index=event.data["index"])
+        else:
+            self.engine.schedule(0, "research", index=event.data["index"])
+
+    def _on_eat(self, event):
+        self._eat_if_hungry()
+        self.engine.schedule(self.EAT_TIME, "research", index=event.data["index"])
+
+    def _on_research(self, event):
+        star = self.graph.get_star(self.current_path[event.data["index"]])
+        alive = self._research(star)
+        next_kind = "recharge" if star.is_hypergiant else "visit_done"
+        self.engine.schedule(star.investigation_time, next_kind, index=event.data["index"], alive=alive)
+
+    def _on_recharge(self, event):
+        star = self.graph.get_star(self.current_path[event.data["index"]])
+        self._recharge(star)
+        self.engine.schedule(0, "visit_done", **event.data)
+
+    def _on_visit_done(self, event):
+        star = self.graph.get_star(self.current_path[event.data["index"]])
+        self._finish_visit(star, event.data["alive"])
+        if self.running:
+            self.engine.schedule(0, "depart", index=event.data["index"] + 1)
+        else:
+            self._end_mission()
+
+    def _on_meteor(self, event):
+        origin, dest = event.data["origin"], event.data["dest"]
+        distance = self.graph.edge_distance(origin, dest)
+        if distance is None:
+            return                   # No such path (or already blocked)
+        self.meteor_blocks[(origin, dest)] = distance
+        self.graph.block_path(origin, dest)
+        self.log("☄️ Meteor blocked the path %s - %s at t=%.1f.", origin, dest, self.engine.now,
+                 level="warning", kind="meteor", star_id=origin)
+
+    def _end_mission(self):
+        """Stops the engine; pending meteors after the mission are irrelevant."""
+        self.running = False
+        self.engine.stop()
 
-        self.log("Simulation finished.")
-        self.generate_report()
+    def _lift_meteor_blocks(self):
+        """
+        Restores the paths blocked by meteors: they only last for the mission
+        and are never saved to the JSON.
+        """
+        for (origin, dest), distance in self.meteor_blocks.items():
+            self.graph.unblock_path(origin, dest, distance)
+        self.meteor_blocks.clear()
+        if self._save_deferred:
+            self._save_deferred = False
+            self.json_manager.save_json(self.graph)
 
     # -------------------------------------------------
     #  Star interactions
@@ -153,51 +273,84 @@ class Simulator:
         if not self.donkey.is_alive():
             return
 
+        self._eat_if_hungry()
+        alive = self._research(star)
+        self._recharge(star)
+        self._finish_visit(star, alive)
+
+    def _eat_if_hungry(self):
         # Eat if energy < 50%
         if self.donkey.energy < 50 and self.donkey.grass_kg > 0:
             self.donkey.eat_grass(1)
-            self.log(f"Donkey ate grass. Energy: {self.donkey.energy:.1f}%")
+            self.log("Donkey ate grass. Energy: %.1f%%", self.donkey.energy, kind="eat",
+                     star_id=getattr(self.donkey.current_star, "id", self.donkey.current_star))
 
-        # Research actions
+    def _research(self, star):
         alive = self.donkey.research_at_star(star)
-        self.log(f"Research at {star.name}. Life left: {self.donkey.life_left:.1f}ly, Energy: {self.donkey.energy:.1f}%")
+        self.log("Research at %s. Life left: %.1fly, Energy: %.1f%%", star.name,
+                 self.donkey.life_left, self.donkey.energy, kind="research", star_id=star.id)
+        return alive
 
+    def _recharge(self, star):
         # Hypergiant effect
         if star.is_hypergiant:
             self.donkey.recharge_on_hypergiant()
-            self.log(f"Hypergiant star {star.name} recharged the donkey!")
+            self.log("Hypergiant star %s recharged the donkey!", star.name, kind="recharge", star_id=star.id)
 
-        # Save JSON state after each visit
-        self.json_manager.save_json(self.graph)
+    def _finish_visit(self, star, alive):
+        # Save JSON state after each visit (once the meteor blocks are lifted)
+        if self.meteor_blocks:
+            self._save_deferred = True
+        else:
+            self.json_manager.save_json(self.graph)
 
         if not alive:
-            self.log(f"The donkey died at {star.name}.")
+            self.log("The donkey died at %s.", star.name, level="warning", kind="death", star_id=star.id)
             self.running = False
 
     # -------------------------------------------------
     #  Utility
     # -------------------------------------------------
     def get_distance(self, origin_id, dest_id):
-        """Returns the distance between two stars if connected."""
-        for v, d in self.graph.get_neighbors(origin_id):
-            if v == dest_id:
-                return d
-        return 0
+        """Returns the shortest travel distance between two stars (0 if unreachable)."""
+        distance = self.graph.shortest_distance(origin_id, dest_id)
+        return distance if distance != float("inf") else 0
+
+    def _emit(self, kind, **data):
+        """Sends a progress event to the listener (e.g. SimulationRunner), if any."""
+        if self.listener is not None:
+            self.listener(kind, **data)
+
+    def _emit_move(self, star_id):
+        donkey = self.donkey
+        self._emit("move", star_id=star_id, energy=donkey.energy, grass_kg=donkey.grass_kg,
+                   life_left=donkey.life_left, health=donkey.health)
+
+    def log(self, message, *args, level="info", kind="message", star_id=None, echo=True):
+        """
+        Records an event in the simulation log (printed too unless echo=False).
+        message is a %-format string for args, formatted only if the event is kept.
+        """
+        if not self.event_log.enabled_for(level):
+            return
+        mission_time = self.engine.now if self.engine is not None else None
+        self.event_log.record(message, level, kind, star_id, mission_time, echo, args)
 
-    def log(self, message):
-        """Stores a message in the simulation log."""
-        print(message)
-        self.logs.append(message)
+    @property
+    def logs(self):
+        """Messages currently held by the event log."""
+        return self.event_log.messages()
 
     def generate_report(self):
         """Generates a summary of the journey."""
         report = {
             "visited_stars": self.visited_stars,
             "total_visited": len(self.visited_stars),
+            "mission_time": self.mission_time,
             "final_status": self.donkey.to_dict(),
             "log": self.logs
         }
-        self.logs.append("=== Simulation Report ===")
-        for key, value in report.items():
-            self.log(f"{key}: {value}")
+        # One summary line; the report itself (and its log) is not logged again
+        self.log("=== Simulation Report === %d stars visited, final status: %s",
+                 report["total_visited"], report["final_status"], kind="report")
         return report
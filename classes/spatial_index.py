@@ -0,0 +1,161 @@
+import heapq
+import math
+
+
+class SpatialIndex:
+    """
+    Uniform grid over Star coordinates for "which stars are near (x, y)" queries.
+    Each cell holds the IDs of the stars whose (x, y) falls inside it, so a query
+    only looks at the cells around the point instead of every star of the graph.
+    Stars can be inserted, moved and removed one at a time.
+    """
+
+    def __init__(self, cell_size=10.0):
+        self.cell_size = float(cell_size)
+        self.cells = {}        # {(cx, cy): {star_id: (x, y)}}
+        self.positions = {}    # {star_id: (x, y)}
+        self._bounds = None    # (min_cx, min_cy, max_cx, max_cy) of non-empty cells
+
+    @classmethod
+    def from_stars(cls, stars, cell_size=None):
+        """
+        Builds an index from Star objects. Without a cell_size, one is chosen so
+        that cells hold about two stars on average.
+        """
+        stars = list(stars)
+        if cell_size is None:
+            cell_size = cls._suggest_cell_size([(s.x, s.y) for s in stars])
+        index = cls(cell_size)
+        index.positions = {star.id: (star.x, star.y) for star in stars}
+        size = index.cell_size
+        cells = index.cells
+        for star_id, (x, y) in index.positions.items():
+            cells.setdefault((math.floor(x / size), math.floor(y / size)), {})[star_id] = (x, y)
+        if cells:
+            cxs = [c[0] for c in cells]
+            cys = [c[1] for c in cells]
+            index._bounds = (min(cxs), min(cys), max(cxs), max(cys))
+        return index
+
+    # -----------------------------
+    #  Updates
+    # -----------------------------
+    def insert(self, star_id, x, y):
+        """Adds a star, or moves it if it is already indexed."""
+        if star_id in self.positions:
+            self.remove(star_id)
+        cell = self._cell(x, y)
+        self.cells.setdefault(cell, {})[star_id] = (x, y)
+        self.positions[star_id] = (x, y)
+        if self._bounds is None:
+            self._bounds = (cell[0], cell[1], cell[0], cell[1])
+        else:
+            x0, y0, x1, y1 = self._bounds
+            self._bounds = (min(x0, cell[0]), min(y0, cell[1]), max(x1, cell[0]), max(y1, cell[1]))
+
+    def remove(self, star_id):
+        """Removes a star; returns False if it was not indexed."""
+        position = self.positions.pop(star_id, None)
+        if position is None:
+            return False
+        cell = self._cell(*position)
+        bucket = self.cells[cell]
+        del bucket[star_id]
+        if not bucket:
+            del self.cells[cell]
+        if not self.positions:
+            self._bounds = None
+        return True
+
+    # -----------------------------
+    #  Queries
+    # -----------------------------
+    def nearest(self, x, y, k=1, max_distance=math.inf):
+        """
+        Returns up to k (distance, star_id) pairs closest to (x, y), nearest first,
+        ignoring stars farther than max_distance.
+        Rings of cells are searched outwards until no unseen cell can be closer
+        than the k-th star found.
+        """
+        if k <= 0 or not self.positions:
+            return []
+        size = self.cell_size
+        cx, cy = self._cell(x, y)
+        x0, y0, x1, y1 = self._bounds
+        max_ring = max(abs(cx - x0), abs(cx - x1), abs(cy - y0), abs(cy - y1))
+
+        best = []          # max-heap of (-distance, star_id)
+        ring = 0
+        while ring <= max_ring:
+            for cell in self._ring(cx, cy, ring):
+                for star_id, (sx, sy) in self.cells.get(cell, {}).items():
+                    d = math.hypot(sx - x, sy - y)
+                    if d > max_distance:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, star_id))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, star_id))
+            # Every cell outside this ring is at least ring * size away
+            reach = ring * size
+            if reach > max_distance or (len(best) == k and -best[0][0] <= reach):
+                break
+            ring += 1
+
+        return sorted((-d, sid) for d, sid in best)
+
+    def nearest_star(self, x, y, max_distance=math.inf):
+        """ID of the star closest to (x, y), or None."""
+        found = self.nearest(x, y, 1, max_distance)
+        return found[0][1] if found else None
+
+    def in_rect(self, x_min, y_min, x_max, y_max):
+        """IDs of the stars with x_min <= x <= x_max and y_min <= y <= y_max."""
+        cx0, cy0 = self._cell(x_min, y_min)
+        cx1, cy1 = self._cell(x_max, y_max)
+        inside = lambda sx, sy: x_min <= sx <= x_max and y_min <= sy <= y_max
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            # Huge rectangle: cheaper to walk the occupied cells
+            return [sid for sid, (sx, sy) in self.positions.items() if inside(sx, sy)]
+
+        result = []
+        for gx in range(cx0, cx1 + 1):
+            for gy in range(cy0, cy1 + 1):
+                for star_id, (sx, sy) in self.cells.get((gx, gy), {}).items():
+                    if inside(sx, sy):
+                        result.append(star_id)
+        return result
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __repr__(self):
+        return f"SpatialIndex(stars={len(self.positions)}, cells={len(self.cells)}, cell_size={self.cell_size})"
+
+    # -----------------------------
+    #  Internal helpers
+    # -----------------------------
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    @staticmethod
+    def _ring(cx, cy, r):
+        """Cells at Chebyshev distance exactly r from (cx, cy)."""
+        if r == 0:
+            yield (cx, cy)
+            return
+        for gx in range(cx - r, cx + r + 1):
+            yield (gx, cy - r)
+            yield (gx, cy + r)
+        for gy in range(cy - r + 1, cy + r):
+            yield (cx - r, gy)
+            yield (cx + r, gy)
+
+    @staticmethod
+    def _suggest_cell_size(points, per_cell=2):
+        if len(points) < 2:
+            return 10.0
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        area = max(max(xs) - min(xs), 1.0) * max(max(ys) - min(ys), 1.0)
+        return max(math.sqrt(area * per_cell / len(points)), 1e-6)
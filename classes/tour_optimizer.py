@@ -0,0 +1,163 @@
+import numpy as np
+
+
+def tour_length(order, matrix):
+    """Length of an open route given as row indices of a distance matrix."""
+    order = np.asarray(order)
+    return float(matrix[order[:-1], order[1:]].sum()) if len(order) > 1 else 0.0
+
+
+class TourOptimizer:
+    """
+    Local search that shortens a route without changing which stars it visits.
+    The first star stays fixed (it is where the donkey is); the route is open, so
+    there is no leg back to the start.
+
+    Two move types are applied until no improving move is left:
+      - 2-opt:  reverse the segment route[i..j]
+      - Or-opt: move a segment of 1..max_segment stars to another position
+    For each move type and start position, the gains of every possible end or
+    target position are computed at once with NumPy on a distance matrix of the
+    route's stars. Segment reversal is priced with prefix sums, so asymmetric
+    distances are handled correctly.
+
+    An optional accept(route) callback can veto moves (e.g. routes the donkey
+    would not survive); rejected moves are skipped and the next best is tried.
+    """
+
+    def __init__(self, graph, max_segment=3, max_sweeps=100):
+        self.graph = graph
+        self.max_segment = max_segment
+        self.max_sweeps = max_sweeps
+        self.last_stats = {}
+
+    # -----------------------------
+    #  Public API
+    # -----------------------------
+    def improve(self, route, accept=None, matrix=None):
+        """
+        Returns (improved_route, distance_saved) for a list of star IDs.
+        Travel between consecutive stars follows shortest paths in the graph;
+        matrix can supply those distances (in route order) if already known.
+        """
+        route = list(route)
+        if len(route) < 3:
+            self.last_stats = {"two_opt_moves": 0, "or_opt_moves": 0, "sweeps": 0, "saved": 0.0}
+            return route, 0.0
+
+        if matrix is None:
+            matrix = self.graph.distance_matrix(route)
+        best, saved = self.improve_order(matrix, accept=self._wrap_accept(route, accept))
+        return [route[i] for i in best], saved
+
+    def improve_order(self, matrix, order=None, accept=None):
+        """
+        Same as improve(), working directly on row indices of a distance matrix.
+        Returns (order, distance_saved).
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        order = np.arange(len(matrix)) if order is None else np.asarray(order)
+        initial = tour_length(order, matrix)
+        stats = {"two_opt_moves": 0, "or_opt_moves": 0, "sweeps": 0}
+
+        for _ in range(self.max_sweeps):
+            stats["sweeps"] += 1
+            improved = False
+            while True:
+                candidate = self._two_opt_sweep(order, matrix, accept)
+                if candidate is None:
+                    break
+                order = candidate
+                stats["two_opt_moves"] += 1
+                improved = True
+            candidate = self._or_opt_sweep(order, matrix, accept)
+            if candidate is not None:
+                order = candidate
+                stats["or_opt_moves"] += 1
+                improved = True
+            if not improved:
+                break
+
+        saved = initial - tour_length(order, matrix)
+        stats["saved"] = saved
+        self.last_stats = stats
+        return order, saved
+
+    # -----------------------------
+    #  Moves
+    # -----------------------------
+    def _two_opt_sweep(self, order, matrix, accept):
+        """Applies the first improving segment reversal found, or returns None."""
+        n = len(order)
+        legs = matrix[order[:-1], order[1:]]
+        back = matrix[order[1:], order[:-1]]
+        forward_sum = np.concatenate(([0.0], np.cumsum(legs)))
+        backward_sum = np.concatenate(([0.0], np.cumsum(back)))
+
+        for i in range(1, n - 1):
+            j = np.arange(i + 1, n)
+            a, b = order[i - 1], order[i]
+            c = order[j]
+            # Old: a->b, c->d and the segment forwards; new: a->c, b->d and it backwards
+            old = matrix[a, b] + (forward_sum[j] - forward_sum[i])
+            new = matrix[a, c] + (backward_sum[j] - backward_sum[i])
+            has_next = j < n - 1
+            d = order[np.minimum(j + 1, n - 1)]
+            old = old + np.where(has_next, matrix[c, d], 0.0)
+            new = new + np.where(has_next, matrix[b, d], 0.0)
+            with np.errstate(invalid="ignore"):
+                gains = old - new
+            candidate = self._best_move(gains, lambda k: np.concatenate(
+                (order[:i], order[i:j[k] + 1][::-1], order[j[k] + 1:])), accept)
+            if candidate is not None:
+                return candidate
+        return None
+
+    def _or_opt_sweep(self, order, matrix, accept):
+        """Applies the first improving segment move found, or returns None."""
+        n = len(order)
+        for length in range(1, self.max_segment + 1):
+            for i in range(1, n - length + 1):
+                segment = order[i:i + length]
+                first, last = segment[0], segment[-1]
+                rest = np.concatenate((order[:i], order[i + length:]))
+                prev = order[i - 1]
+                if i + length < n:
+                    nxt = order[i + length]
+                    removed = matrix[prev, first] + matrix[last, nxt] - matrix[prev, nxt]
+                else:
+                    removed = matrix[prev, first]
+
+                # Insert after rest[k]; k = i - 1 is where the segment came from
+                k = np.arange(len(rest))
+                a = rest[k]
+                b = rest[np.minimum(k + 1, len(rest) - 1)]
+                at_end = k == len(rest) - 1
+                inserted = matrix[a, first] + np.where(
+                    at_end, 0.0, matrix[last, b] - matrix[a, b])
+                with np.errstate(invalid="ignore"):
+                    gains = removed - inserted
+                gains[i - 1] = -np.inf
+                candidate = self._best_move(gains, lambda m: np.concatenate(
+                    (rest[:m + 1], segment, rest[m + 1:])), accept)
+                if candidate is not None:
+                    return candidate
+        return None
+
+    @staticmethod
+    def _best_move(gains, build, accept, epsilon=1e-9):
+        """Returns the route of the best improving, accepted move, or None."""
+        gains = np.where(np.isfinite(gains), gains, -np.inf)
+        for k in np.argsort(-gains):
+            if gains[k] <= epsilon:
+                return None
+            candidate = build(int(k))
+            if accept is None or accept(candidate):
+                return candidate
+        return None
+
+    @staticmethod
+    def _wrap_accept(route, accept):
+        if accept is None:
+            return None
+        return lambda order: accept([route[i] for i in order])
@@ -0,0 +1,99 @@
+import atexit
+import threading
+
+
+class WriteBehindPersister:
+    """
+    Coalesces save requests: mark_dirty() only flags that the data changed,
+    and a background thread calls write() at most once every `delay` seconds
+    while there are pending changes. flush() writes immediately on the calling
+    thread; close() (also run at interpreter exit) flushes and stops the thread.
+
+    A write() that raises keeps the data dirty, so it is retried on the next tick.
+    """
+
+    def __init__(self, write, delay=1.0, name="write-behind"):
+        self.write = write
+        self.delay = delay
+        self.name = name
+        self.requests = 0            # mark_dirty() calls
+        self.writes = 0              # Actual write() calls that succeeded
+        self.errors = 0
+        self._dirty = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()   # One write at a time (timer vs. flush)
+        self._thread = None
+
+    def mark_dirty(self):
+        """Records a change; it will be written by the background thread."""
+        with self._cond:
+            self.requests += 1
+            self._dirty = True
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+                    atexit.register(self.close)
+                self._cond.notify()
+        if closed:
+            self.flush()
+
+    def flush(self):
+        """Writes pending changes now. Returns True if something was written."""
+        with self._write_lock:
+            with self._cond:
+                if not self._dirty:
+                    return False
+                self._dirty = False
+            try:
+                self.write()
+            except Exception as error:
+                with self._cond:
+                    self._dirty = True
+                    self.errors += 1
+                print(f"⚠️ {self.name}: write failed ({error}); will retry.")
+                return False
+            self.writes += 1
+            return True
+
+    def close(self):
+        """Stops the background thread and writes anything still pending."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+    @property
+    def pending(self):
+        return self._dirty
+
+    def stats(self):
+        """Save requests, actual writes, and writes avoided by coalescing."""
+        pending = 1 if self._dirty else 0
+        return {
+            "requests": self.requests,
+            "writes": self.writes,
+            "saved_writes": self.requests - self.writes - pending,
+            "pending": bool(pending),
+            "errors": self.errors,
+        }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Let more changes accumulate; close() wakes us up early
+                self._cond.wait(self.delay)
+                if self._closed:
+                    return
+            self.flush()
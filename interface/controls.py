@@ -42,11 +42,21 @@ class ControlPanel(tk.Frame):
         grass_slider = ttk.Scale(self, from_=0, to=50, variable=self.grass_var, orient="horizontal")
         grass_slider.pack(fill="x", padx=10, pady=5)
 
-        # Buttons
-        ttk.Button(self, text="Apply Changes", command=self.apply_changes).pack(pady=8)
-        ttk.Button(self, text="Block Path", command=self.block_path).pack(pady=4)
-        ttk.Button(self, text="Unblock Path", command=self.unblock_path).pack(pady=4)
+        # Simulation progress
+        self.status_var = tk.StringVar(value="Idle")
+        tk.Label(self, textvariable=self.status_var, bg="#202020", fg="#a0a0a0",
+                 wraplength=220, justify="left").pack(anchor="w", padx=10, pady=5)
+
+        # Buttons (the editing ones are disabled while a simulation runs)
+        self.edit_buttons = [
+            ttk.Button(self, text="Apply Changes", command=self.apply_changes),
+            ttk.Button(self, text="Block Path", command=self.block_path),
+            ttk.Button(self, text="Unblock Path", command=self.unblock_path),
+        ]
+        for button, pady in zip(self.edit_buttons, (8, 4, 4)):
+            button.pack(pady=pady)
         ttk.Button(self, text="Redraw Graph", command=self.redraw).pack(pady=8)
+        ttk.Button(self, text="Cache Stats", command=self.show_cache_stats).pack(pady=4)
 
     # -------------------------------------------------
     #  Button Actions
@@ -71,9 +81,8 @@ class ControlPanel(tk.Frame):
         """Blocks a connection between two stars (example)."""
         from_id = self._ask_star("Origin star ID to block:")
         to_id = self._ask_star("Destination star ID to block:")
-        if from_id and to_id:
-            self.simulator.graph.block_path(from_id, to_id)
-            self.json_manager.save_json(self.simulator.graph)
+        if from_id is not None and to_id is not None:
+            self.json_manager.block_path(self.simulator.graph, from_id, to_id)
             messagebox.showinfo("Blocked", f"Path {from_id} ↔ {to_id} blocked.")
             self.redraw()
 
@@ -81,19 +90,48 @@ class ControlPanel(tk.Frame):
         """Unblocks a previously blocked connection."""
         from_id = self._ask_star("Origin star ID to unblock:")
         to_id = self._ask_star("Destination star ID to unblock:")
-        if from_id and to_id:
+        if from_id is not None and to_id is not None:
             distance = 5.0  # placeholder; later you can ask user for real distance
-            self.simulator.graph.unblock_path(from_id, to_id, distance)
-            self.json_manager.save_json(self.simulator.graph)
+            self.json_manager.unblock_path(self.simulator.graph, from_id, to_id, distance)
             messagebox.showinfo("Unblocked", f"Path {from_id} ↔ {to_id} restored.")
             self.redraw()
 
+    def set_editing(self, enabled):
+        """
+        Enables or disables the controls that change the donkey or the graph.
+        The simulation worker reads both (and the graph caches) without locks,
+        so they stay disabled while it runs.
+        """
+        for button in self.edit_buttons:
+            button.state(["!disabled"] if enabled else ["disabled"])
+
+    def show_progress(self, data):
+        """Shows the donkey state carried by a simulation "move" event."""
+        self.health_var.set(data["health"])
+        self.energy_var.set(data["energy"])
+        self.grass_var.set(data["grass_kg"])
+        self.status_var.set(f"At star {data['star_id']} - life left {data['life_left']:.1f}")
+
     def redraw(self):
         """Redraws the graph canvas."""
         self.canvas.draw_constellations()
         if self.simulator and self.simulator.current_path:
             self.canvas.draw_route(self.simulator.current_path)
 
+    def show_cache_stats(self):
+        """Shows the graph version and shortest-path cache counters."""
+        stats = self.simulator.graph.cache_stats()
+        lines = [f"Graph version: {stats['version']}"]
+        for name in ("path_cache", "distance_cache"):
+            if name in stats:
+                values = ", ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+                                   for k, v in stats[name].items())
+                lines.append(f"{name}: {values}")
+        persist = self.json_manager.persist_stats()
+        lines.append(f"JSON saves: {persist['requests']} requested, {persist['writes']} written, "
+                     f"{persist['saved_writes']} coalesced")
+        messagebox.showinfo("Cache Stats", "\n".join(lines))
+
     def _ask_star(self, prompt):
         """Simple dialog to ask for a star ID."""
         popup = tk.Toplevel(self)
@@ -110,4 +148,8 @@ class ControlPanel(tk.Frame):
 
         ttk.Button(popup, text="OK", command=confirm).pack()
         popup.wait_window()
-        return result.get("value")
+        value = result.get("value") or None     # Empty entry or closed dialog
+        # Star IDs in the JSON are usually numbers; the entry gives text
+        if value and value.lstrip("-").isdigit() and int(value) in self.simulator.graph.nodes:
+            return int(value)
+        return value
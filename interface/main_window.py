@@ -4,6 +4,7 @@ from classes.json_manager import JsonManager
 from classes.graph import Graph
 from classes.donkey import Donkey
 from classes.simulator import Simulator
+from classes.simulation_runner import SimulationRunner
 from interface.map_canvas import MapCanvas
 from interface.controls import ControlPanel
 from interface.final_report import FinalReport
@@ -15,6 +16,8 @@ class MainWindow(tk.Tk):
     Handles UI layout, JSON loading, and simulation control.
     """
 
+    POLL_MS = 16        # Progress polling interval (~60 fps)
+
     def __init__(self):
         super().__init__()
         self.title("NASA Donkey Graph Simulator")
@@ -22,10 +25,11 @@ class MainWindow(tk.Tk):
         self.configure(bg="#101010")
 
         # Core components
-        self.json_manager = JsonManager()
         self.graph = Graph()
+        self.json_manager = JsonManager(self.graph)
         self.donkey = None
         self.simulator = None
+        self.runner = None
 
         # UI setup
         self.create_menu()
@@ -60,6 +64,7 @@ class MainWindow(tk.Tk):
 
         self.canvas = MapCanvas(self.canvas_frame, self.graph)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.canvas.on_star_selected = self.on_star_selected
 
         # Control panel on the left
         self.controls = None  # We'll create it after loading JSON
@@ -69,12 +74,18 @@ class MainWindow(tk.Tk):
     # -------------------------------------------------
     def load_json(self):
         """Loads the constellation data and draws it."""
+        if self.runner and self.runner.is_running():
+            messagebox.showinfo("Simulation", "Stop the running simulation before loading a file.")
+            return
         constellations = self.json_manager.load_json()
         if not constellations:
             return
 
-        for c in constellations:
-            self.graph.add_constellation(c)
+        # The loader already added the stars, connections and constellations to the graph
+        print(f"Loaded {len(constellations)} constellations, "
+              f"{self.graph.collapsed_duplicates} duplicate connections collapsed, "
+              f"{self.graph.connectivity_index().count()} connected components.")
+        self.graph.rebuild_spatial_index()
 
         #self.status_label.config(text=f"Loaded {len(constellations)} constellations.")
         self.draw_graph()
@@ -82,6 +93,7 @@ class MainWindow(tk.Tk):
         # Initialize the donkey and simulator
         self.donkey = Donkey(health="excellent", age=5, energy=100, grass_kg=10, life_left=100)
         self.simulator = Simulator(self.graph, self.donkey, self.json_manager)
+        self.runner = SimulationRunner(self.simulator)
 
         # Add control panel (now that simulator exists)
         if not self.controls:
@@ -94,26 +106,69 @@ class MainWindow(tk.Tk):
         self.canvas.draw_constellations()
 
     def start_simulation(self):
-        """Starts the simulation if data is loaded."""
+        """Starts the simulation on a worker thread if data is loaded."""
         if not self.simulator:
             messagebox.showwarning("Warning", "Load a JSON file first.")
             return
+        if self.runner.is_running():
+            messagebox.showinfo("Simulation", "A simulation is already running.")
+            return
 
-        # Start simulation from first star (later user can pick one)
-        start_id = list(self.graph.nodes.keys())[0]
-        self.simulator.start_simulation(start_id, mode="max_stars")
-
-        # Mostrar la ruta en el canvas
-        self.canvas.draw_route(self.simulator.current_path)
-
-        report_data = self.simulator.generate_report()
-        FinalReport(self, report_data)
-
-        # Update interface with donkey data
-        self.update_status()
+        # Start from the star clicked on the map, or the first one
+        start_id = self.canvas.selected_star
+        if start_id not in self.graph.nodes:
+            start_id = list(self.graph.nodes.keys())[0]
+        self.runner.start(start_id, mode="max_stars")
+        if self.controls:
+            self.controls.set_editing(False)
+        self.after(self.POLL_MS, self._poll_simulation)
+
+    def _poll_simulation(self):
+        """Applies the runner's queued progress events; reschedules itself while it runs."""
+        finished = False
+        for kind, data in self.runner.poll():
+            if kind == "planning":
+                self._set_status("Planning route...")
+            elif kind == "route":
+                # Mostrar la ruta en el canvas
+                self.canvas.draw_route(data["path"])
+                self._set_status(f"Route: {len(data['path'])} stars ({data['stats']['method']})")
+            elif kind == "move":
+                self.canvas.mark_donkey(data["star_id"])
+                if self.controls:
+                    self.controls.show_progress(data)
+            elif kind == "done":
+                finished = True
+                self._set_status("Simulation finished.")
+                FinalReport(self, data["report"])
+            elif kind == "cancelled":
+                finished = True
+                self._set_status("Simulation cancelled.")
+            elif kind == "error":
+                finished = True
+                self._set_status("Simulation failed.")
+                messagebox.showerror("Simulation", str(data["error"]))
+
+        if finished:
+            # Update interface with donkey data
+            if self.controls:
+                self.controls.set_editing(True)
+            self.update_status()
+        elif self.runner.is_running() or not self.runner.events.empty():
+            self.after(self.POLL_MS, self._poll_simulation)
+
+    def _set_status(self, text):
+        if self.controls:
+            self.controls.status_var.set(text)
+
+    def on_star_selected(self, star):
+        """Called when a star is clicked on the map."""
+        self.title(f"NASA Donkey Graph Simulator - {star.name} selected")
 
     def stop_simulation(self):
-        if self.simulator:
+        if self.runner and self.runner.is_running():
+            self.runner.cancel()
+        elif self.simulator:
             self.simulator.stop_simulation()
             messagebox.showinfo("Simulation", "Simulation stopped.")
 
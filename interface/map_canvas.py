@@ -4,13 +4,21 @@ import random
 class MapCanvas(tk.Canvas):
     """
     Custom canvas to visualize constellations, stars, and donkey routes.
+    Clicking near a star selects it (see on_star_selected).
     """
 
+    SCALE = 3           # Canvas pixels per galaxy unit
+    PICK_RADIUS = 8     # Max click distance (pixels) to select a star
+
     def __init__(self, parent, graph, **kwargs):
         super().__init__(parent, bg="black", **kwargs)
         self.graph = graph
         self.colors = {}  # Constellation name -> color
         self.route = []   # List of star IDs in the current path
+        self.selected_star = None      # ID of the star picked with the mouse
+        self.on_star_selected = None   # Optional callback(star)
+
+        self.bind("<Button-1>", self._on_click)
 
     # -------------------------------------------------
     #  Drawing methods
@@ -35,8 +43,8 @@ class MapCanvas(tk.Canvas):
                 star2 = self.graph.get_star(dest)
                 if star1 and star2:
                     self.create_line(
-                        star1.x * 3, star1.y * 3,
-                        star2.x * 3, star2.y * 3,
+                        star1.x * self.SCALE, star1.y * self.SCALE,
+                        star2.x * self.SCALE, star2.y * self.SCALE,
                         fill=self.colors[const.name],
                         width=1.2
                     )
@@ -51,10 +59,11 @@ class MapCanvas(tk.Canvas):
             if const_count > 1:
                 color = "red"
             self.create_oval(
-                star.x * 3 - 4, star.y * 3 - 4,
-                star.x * 3 + 4, star.y * 3 + 4,
+                star.x * self.SCALE - 4, star.y * self.SCALE - 4,
+                star.x * self.SCALE + 4, star.y * self.SCALE + 4,
                 fill=color, outline=""
             )
+        self._draw_selection()
 
     def draw_route(self, path):
         """Draws the donkey's route as a highlighted line."""
@@ -63,18 +72,76 @@ class MapCanvas(tk.Canvas):
         self.route = path
 
         for i in range(len(path) - 1):
-            s1 = self.graph.get_star(path[i])
-            s2 = self.graph.get_star(path[i + 1])
-            if s1 and s2:
-                self.create_line(
-                    s1.x * 3, s1.y * 3,
-                    s2.x * 3, s2.y * 3,
-                    fill="cyan", width=2.5
-                )
+            leg = self._route_leg(path[i], path[i + 1])
+            for origin, dest in zip(leg, leg[1:]):
+                s1 = self.graph.get_star(origin)
+                s2 = self.graph.get_star(dest)
+                if s1 and s2:
+                    self.create_line(
+                        s1.x * self.SCALE, s1.y * self.SCALE,
+                        s2.x * self.SCALE, s2.y * self.SCALE,
+                        fill="cyan", width=2.5
+                    )
+
+    # -------------------------------------------------
+    #  Selection
+    # -------------------------------------------------
+    def star_at(self, canvas_x, canvas_y):
+        """Returns the star under a canvas point, or None."""
+        star_id = self.graph.spatial_index.nearest_star(
+            canvas_x / self.SCALE, canvas_y / self.SCALE,
+            max_distance=self.PICK_RADIUS / self.SCALE
+        )
+        return self.graph.get_star(star_id) if star_id is not None else None
+
+    def select_star(self, star_id):
+        """Marks a star as selected and notifies on_star_selected."""
+        self.selected_star = star_id
+        self._draw_selection()
+        star = self.graph.get_star(star_id)
+        if star and self.on_star_selected:
+            self.on_star_selected(star)
+
+    def _on_click(self, event):
+        star = self.star_at(self.canvasx(event.x), self.canvasy(event.y))
+        if star:
+            self.select_star(star.id)
+
+    def _draw_selection(self):
+        self.delete("selection")
+        star = self.graph.get_star(self.selected_star)
+        if not star:
+            return
+        r = 7
+        self.create_oval(
+            star.x * self.SCALE - r, star.y * self.SCALE - r,
+            star.x * self.SCALE + r, star.y * self.SCALE + r,
+            outline="yellow", width=2, tags="selection"
+        )
+
+    def mark_donkey(self, star_id):
+        """Moves the donkey marker to a star (progress of a running simulation)."""
+        self.delete("donkey")
+        star = self.graph.get_star(star_id)
+        if not star:
+            return
+        r = 5
+        self.create_rectangle(
+            star.x * self.SCALE - r, star.y * self.SCALE - r,
+            star.x * self.SCALE + r, star.y * self.SCALE + r,
+            fill="orange", outline="white", tags="donkey"
+        )
 
     # -------------------------------------------------
     #  Utility
     # -------------------------------------------------
+    def _route_leg(self, origin_id, dest_id):
+        """Stars actually travelled between two consecutive stops of a route."""
+        _, _, leg = self.graph.bidirectional_dijkstra(origin_id, dest_id)
+        if not leg or leg[0] != origin_id:
+            return [origin_id, dest_id]   # Unreachable: keep the straight line
+        return leg
+
     def _random_color(self):
         """Generates a random bright color for constellations."""
         r = lambda: random.randint(80, 255)